@@ -86,7 +86,54 @@ proc_sorting="cpu lazy"
 #* Reverse sorting order, "true" or "false"
 proc_reversed="false"
 
-#* Check cpu temperature, only works if "sensors" command is available and have values for "Package" and "Core"
+#* Update time in milliseconds for the process list, rounded to closest multiple of update_ms, "0" to update together with the rest
+proc_update_ms="0"
+
+#* Max percent of one core to spend on updating the process list, updates less often if needed to stay below, "0" to disable
+proc_cpu_budget="0"
+
+#* Windowed process list, only processes on the visible page and the detailed process are read every update, "true" or "false"
+#* the rest is read a little at a time while waiting for next update, sorting then uses older values for processes not shown
+proc_windowed="false"
+
+#* Max number of processes to keep mini graphs for, graph of the process shown longest ago is replaced when full
+proc_graph_max="100"
+
+#* Show cpu total as a stacked meter of user, system, iowait and steal time, "true" or "false"
+cpu_stacked="false"
+
+#* Show interrupts and softirqs per second for the busiest cpus in place of the cpu graph, toggled with "v", "true" or "false"
+cpu_irq_view="false"
+
+#* Extra fields from "/proc/meminfo" shown as meters below memory and swap if there is room left, space separated
+mem_fields="Buffers Shmem Slab SReclaimable Dirty Writeback AnonHugePages CommitLimit Committed_AS"
+
+#* Update time in milliseconds for cpu usage, frequency and load, rounded to closest multiple of update_ms, "0" to update together with the rest
+cpu_update_ms="0"
+
+#* Update time in milliseconds for cpu temperatures, rounded to closest multiple of update_ms, "0" to update together with the rest
+temp_update_ms="0"
+
+#* Update time in milliseconds for memory and swap, rounded to closest multiple of update_ms, "0" to update together with the rest
+#* memory changes slowly compared to cpu and network, so the default is every 10 seconds
+mem_update_ms="10000"
+
+#* Update time in milliseconds for pressure stall graphs, rounded to closest multiple of update_ms, "0" to update together with the rest
+pressure_update_ms="0"
+
+#* Update time in milliseconds for disk usage, "df" runs in the background and is only asked about disks that fits in the memory box
+disk_update_ms="10000"
+
+#* Update time in milliseconds for disk read and write speeds, rounded to closest multiple of update_ms, "0" to update together with the rest
+diskio_update_ms="0"
+
+#* Update time in milliseconds for network speeds, rounded to closest multiple of update_ms, "0" to update together with the rest
+net_update_ms="0"
+
+#* Show pressure stall graphs for cpu, memory and io at the bottom of the memory box if supported by the kernel, "true" or "false"
+mem_pressure="true"
+
+#* Check cpu temperature, reads sensors from "/sys/class/hwmon" or "/sys/class/thermal" if any cpu sensor is found
 check_temp="true"
 
 #* Draw a clock at top of screen, formatting according to strftime, empty string to disable
@@ -132,18 +179,24 @@ menu_quit_selected=(
 "║═╬╗║ ║ ║ ║  "
 "╚═╝╚╚═╝ ╩ ╩  ")
 
-declare -A cpu mem swap proc net box theme
+declare -A cpu mem swap proc net box theme psi irq irq_old meminfo disk_df diskio
 declare -a cpu_usage cpu_graph_a cpu_graph_b color_meter color_temp_graph color_cpu color_cpu_graph cpu_history color_mem_graph color_swap_graph
 declare -a mem_history swap_history net_history_download net_history_upload mem_graph swap_graph proc_array download_graph upload_graph trace_array
 declare resized=1 size_error clock tty_width tty_height hex="16#" cpu_p_box swap_on=1 draw_out esc_character boxes_out last_screen clock_out update_string
 declare -a options_array=("color_theme" "update_ms" "proc_sorting" "check_temp" "draw_clock" "background_update" "error_logging" "custom_cpu_name")
-declare -a save_array=("${options_array[@]}" "proc_reversed")
+declare -a save_array=("${options_array[@]}" "proc_reversed" "cpu_irq_view")
 declare -a sorting=( "pid" "program" "arguments" "threads" "user" "memory" "cpu lazy" "cpu responsive" )
-declare -a pid_history detail_graph detail_history detail_mem_history
+declare -a cpu_freq cpu_freq_path cpu_temp_path cpu_socket cpu_ids cpu_thread cpu_allowed cpu_user cpu_nice cpu_system cpu_idle cpu_iowait cpu_irq cpu_softirq cpu_steal cpu_guest cpu_guest_nice cpu_total_old cpu_idle_old
+declare -a detail_graph detail_history detail_mem_history pid_list sort_text_keys filter_fields filter_terms proc_order proc_page
+declare -A pid_comm pid_state pid_ppid pid_ticks pid_threads pid_rss pid_start pid_args pid_uid user_names sort_text_known
+declare -A pid_old_ticks pid_old_time filter_cache cpu_percent graph_slot
+declare -a graph_pool graph_pool_count graph_pool_pid graph_pool_used
+declare -a irq_total irq_classes irq_cols_softirqs irq_cols_interrupts
 declare time_left timestamp_start timestamp_end timestamp_input_start timestamp_input_end time_string mem_out proc_misc prev_screen pause_screen filter input_to_filter
-declare no_epoch proc_det proc_misc2 sleeping=0 detail_mem_graph proc_det2 proc_out curled git_version
+declare no_epoch epoch_anchor uptime_anchor proc_det proc_misc2 sleeping=0 detail_mem_graph proc_det2 proc_out curled git_version
 declare esc_character tab backspace sleepy late_update skip_process_draw winches quitting theme_int
-declare -a disks_free disks_total disks_name disks_free_percent saved_key themes
+declare -a disks_free disks_total disks_name disks_free_percent disks_mount disks_dev disks_io_dev disks_io_line saved_key themes
+declare df_fd psi_out io_out
 printf -v esc_character "\u1b"
 printf -v tab "\u09"
 printf -v backspace "\u7F"
@@ -157,8 +210,29 @@ graph_symbol=(" " "⡀" "⣀" "⣄" "⣤" "⣦" "⣴" "⣶" "⣷" "⣾" "⣿")
 graph_symbol+=( " " "⣿" "⢿" "⡿" "⠿" "⠻" "⠟"  "⠛" "⠙" "⠉" "⠈")
 box[boxes]="cpu mem net processes"
 
+#* Collectors run by collect_and_draw when due, with the box their data is shown in and the option holding their update time
+declare -a collectors=("processes" "cpu" "temps" "mem" "pressure" "disks" "diskio" "net")
+declare -A collector collector_changed
+collector=(
+	[processes_box]="processes"	[processes_function]="collect_processes"	[processes_option]="proc_update_ms"
+	[cpu_box]="cpu"			[cpu_function]="collect_cpu"			[cpu_option]="cpu_update_ms"
+	[temps_box]="cpu"		[temps_function]="collect_cpu_temps"		[temps_option]="temp_update_ms"
+	[mem_box]="mem"			[mem_function]="collect_mem"			[mem_option]="mem_update_ms"
+	[pressure_box]="mem"		[pressure_function]="collect_pressure"		[pressure_option]="pressure_update_ms"
+	[disks_box]="mem"		[disks_function]="collect_disks"		[disks_option]="disk_update_ms"
+	[diskio_box]="mem"		[diskio_function]="collect_diskio"		[diskio_option]="diskio_update_ms"
+	[net_box]="net"			[net_function]="collect_net"			[net_option]="net_update_ms"
+)
+
 cpu[threads]=0
 
+#* Units and limits for floating_humanizer, a value scaled by 100 needs one more step of 1024 for each limit it is above
+declare -a humanizer_units=(Byte KiB MiB GiB TiB PiB bit Kib Mib Gib Tib Pib)
+declare -a humanizer_limit=(100000 102400000 104857600000 107374182400000 109951162777600000)
+declare -A humanizer_cache_0 humanizer_cache_1
+declare -n humanizer_cache_now=humanizer_cache_0 humanizer_cache_prev=humanizer_cache_1
+declare humanizer_cache_size=256
+
 #* Symbols for subscript function
 subscript=("₀" "₁" "₂" "₃" "₄" "₅" "₆" "₇" "₈" "₉")
 
@@ -188,11 +262,16 @@ if [[ -n $EPOCHREALTIME ]]; then
 		ms_out=$((${EPOCHREALTIME/[.,]/}/1000))
 	}
 
-#* If not, use date command
+#* If not, use centiseconds from "/proc/uptime" added to epoch time taken with date command once at start, avoids forking for every timestamp
 else
-	get_ms() { #? Set given variable to current epoch millisecond with date command
+	read -r uptime_anchor epoch_anchor </proc/uptime
+	uptime_anchor=$((10#${uptime_anchor/./}))
+	read -r epoch_anchor < <(date +%s%3N)
+	get_ms() { #? Set given variable to current epoch millisecond from "/proc/uptime" and epoch time at start
 		local -n ms_out=$1
-		read ms_out < <(date +%s%3N)
+		local uptime_now uptime_skip
+		read -r uptime_now uptime_skip </proc/uptime
+		ms_out=$(( epoch_anchor+(10#${uptime_now/./}-uptime_anchor)*10 ))
 	}
 fi
 
@@ -203,15 +282,15 @@ init_() { #? Collect needed information and set options before startig main loop
 	stty -echo
 	tput civis
 
-	#* Check if "sensors" command is available, if not, disable temperature collection
-	if [[ $check_temp != false ]] && command -v sensors >/dev/null 2>&1; then check_temp="true"; else check_temp="false"; fi
-
 	#* Check if "curl" command is available, if not, disable update check and theme downloads
 	if command -v curl >/dev/null 2>&1; then curled=1; else unset curled; fi
 
 	#* Get number of cores and cpu threads
 	get_cpu_info
 
+	#* Find cpu temperature sensors, if none is found, disable temperature collection
+	if get_temp_sources && [[ $check_temp != false ]]; then check_temp="true"; else check_temp="false"; fi
+
 	#* Get processor BCLK
 	local param_var
 	if [[ -e /usr/include/asm-generic/param.h ]]; then
@@ -221,22 +300,78 @@ init_() { #? Collect needed information and set options before startig main loop
 		cpu[hz]="100"
 	fi
 
+	#* Find the cpuset of the cgroup we are running in, cpus outside of it are left out of cpu usage
+	local cgroup_line cgroup_file
+	if [[ -r /proc/self/cgroup ]]; then
+		while read -r cgroup_line; do
+			case ${cgroup_line} in
+				*:cpuset:*) cgroup_line="${cgroup_line#*:cpuset:}"; cgroup_file="/sys/fs/cgroup/cpuset${cgroup_line%/}/cpuset.effective_cpus"; break;;
+				0::*) cgroup_line="${cgroup_line#0::}"; cgroup_file="/sys/fs/cgroup${cgroup_line%/}/cpuset.cpus.effective";;
+			esac
+		done </proc/self/cgroup
+	fi
+	if [[ ! -r ${cgroup_file} && -r /sys/fs/cgroup/cpuset.cpus.effective ]]; then cgroup_file="/sys/fs/cgroup/cpuset.cpus.effective"; fi
+	if [[ -r ${cgroup_file} ]]; then cpu[cpuset_file]="${cgroup_file}"; fi
+
 	#* Get max pid value and length
 	proc[pid_max]="$(</proc/sys/kernel/pid_max)"
 	proc[pid_len]=${#proc[pid_max]}
 	if [[ ${proc[pid_len]} -lt 5 ]]; then proc[pid_len]=5; fi
 
-	#* Call init for cpu data collection
+	#* Create glob patterns for "/proc/[pid]" grouped by number of digits, globbing then returns pids in numerical order
+	local scan_digits="[1-9]"
+	unset 'proc[scan_glob]'
+	for((i=0;i<${#proc[pid_max]};i++)); do
+		proc[scan_glob]+="/proc/${scan_digits} "
+		scan_digits+="[0-9]"
+	done
+
+	#* Get memory page size in KiB for converting process rss
+	proc[page_kb]=$(( $(getconf PAGESIZE 2>/dev/null || echo 4096)/1024 ))
+
+	#* Check size of mini graph pool for process list
+	if ! is_int "${proc_graph_max}" || ((proc_graph_max<1)); then proc_graph_max=100; fi
+
+	#* Check update times for collectors and cpu budget for process list
+	local name
+	for name in "${collectors[@]}"; do
+		local -n update_option="${collector[${name}_option]}"
+		if ! is_int "${update_option}"; then update_option=0; fi
+		collector[${name}_interval]=${update_option}
+	done
+	if ! is_int "${proc_cpu_budget}" || ((proc_cpu_budget>100)); then proc_cpu_budget=0; fi
+
+	#* Get user names for process list, a stamp file is used to see if "/etc/passwd" has been modified since it was read
+	#* The stamp is created with "mktemp" so no existing file or symlink with a guessable name is ever written to
+	proc[passwd_stamp]="$(mktemp "${XDG_RUNTIME_DIR:-/tmp}/.bashtop_passwd_stamp.XXXXXX" 2>/dev/null)" || unset 'proc[passwd_stamp]'
+	get_users
+
+	#* Call init for cpu data collection and collect cpu temps if enabled
 	collect_cpu init
+	if [[ $check_temp == true ]]; then collect_cpu_temps; fi
+
+	#* Check for pressure stall information, the files can exist but fail to read if disabled at boot
+	local psi_line
+	if [[ $mem_pressure == true ]] && read -r psi_line 2>/dev/null </proc/pressure/cpu; then psi[available]=1; fi
+
+	#* Limit time "df" can run, a hanging network filesystem would otherwise keep it running
+	if command -v timeout >/dev/null 2>&1; then mem[df_timeout]="timeout -k 1 5"; fi
 
 	#* Call init for memory data collection and check if swap is available
-	mem[counter]=10
-	collect_mem init
+	collect_mem
+	if [[ -n ${psi[available]} ]]; then collect_pressure; fi
+	collect_disks init
+	collect_diskio
 
 	#* Get default network device from "ip route" command and call init for net collection
 	get_value -v 'net[device]' -ss "$(ip route get 1.1.1.1)" -k "dev" -mk 1
 	collect_net init
 
+	#* Collectors are next due one update time from now since all have been run once
+	local init_time
+	get_ms init_time
+	for name in "${collectors[@]}"; do collector[${name}_last]=${init_time}; done
+
 	#* Check if newer version of bashtop is available from https://github.com/aristocratos/bashtop
 	if [[ -n $curled ]]; then
 		if ! get_value -v git_version -ss "$(curl -m 2 --raw -r 0-3500 https://raw.githubusercontent.com/aristocratos/bashtop/master/bashtop 2>/dev/null)" -k "version=" -r "[^0-9.]"; then unset git_version; fi
@@ -422,7 +557,7 @@ quit_() { #? Clean exit
 	if [[ $config_file != "/dev/null" ]]; then
 		save_config "${save_array[@]}"
 	fi
-	
+
 	exit 0
 }
 
@@ -606,6 +741,34 @@ sort_array_int() {	#? Copy and sort an array of integers from largest to smalles
 	out_arr=("${array[@]}")	
 }
 
+sort_array_str() {	#? Copy and sort an array of strings from smallest to largest value, usage: sort_array_str "input array" "output array"
+	local -n str_in_arr="$1"
+	local -n str_out_arr="$2"
+	local str_width str_left str_mid str_right str_i str_j
+	local -a str_array=("${str_in_arr[@]}") str_merged
+
+	#* Bottom up merge sort, merging runs of doubling width until the whole array is one sorted run
+	for ((str_width=1;str_width<${#str_array[@]};str_width*=2)); do
+		str_merged=()
+		for ((str_left=0;str_left<${#str_array[@]};str_left+=str_width*2)); do
+			str_mid=$((str_left+str_width)); str_right=$((str_left+str_width*2))
+			if ((str_mid>${#str_array[@]})); then str_mid=${#str_array[@]}; fi
+			if ((str_right>${#str_array[@]})); then str_right=${#str_array[@]}; fi
+			for ((str_i=str_left,str_j=str_mid;str_i<str_mid || str_j<str_right;)); do
+				if ((str_j>=str_right)) || { ((str_i<str_mid)) && [[ ! ${str_array[str_j]} < ${str_array[str_i]} ]]; }; then
+					str_merged+=("${str_array[str_i++]}")
+				else
+					str_merged+=("${str_array[str_j++]}")
+				fi
+			done
+		done
+		str_array=("${str_merged[@]}")
+	done
+
+	#* Write the sorted array to output array
+	str_out_arr=("${str_array[@]}")
+}
+
 subscript() { #? Convert an integer to a string of subscript numbers
 	local i out int=$1
 	for((i=0;i<${#int};i++)); do
@@ -641,43 +804,62 @@ is_hex() { #? Check if value(s) is hexadecimal
 
 floating_humanizer() { 	#? Convert integer to floating point and scale up in steps of 1024 to highest positive unit
 						#? Usage: floating_humanizer <-b,-bit|-B,-Byte> [-ps,-per-second] [-s,-start "1024 multiplier start"] [-v,-variable-output] <input>
-	local value selector per_second unit_mult decimals out_var ext_var
-	local -a unit
+	local value selector=0 per_second unit_offset unit_mult decimals key shift out ext_var next
+
 	until (($#==0)); do
 		case "$1" in
-			-b|-bit) unit=(bit Kib Mib Gib Tib Pib); unit_mult=8;;
-			-B|-Byte) unit=(Byte KiB MiB GiB TiB PiB); unit_mult=1;;
+			-b|-bit) unit_offset=6; unit_mult=8;;
+			-B|-Byte) unit_offset=0; unit_mult=1;;
 			-ps|-per-second) per_second=1;;
 			-s|-start) selector="$2"; shift;;
 			-v|-variable-output) local -n out_var="$2"; ext_var=1; shift;;
-			*) if is_int "$1"; then value=$1; break; fi;;
+			*) if [[ $1 == +([0-9]) ]]; then value=$1; break; fi;;
 		esac
 		shift
 	done
 	
-	if [[ -z $value || $value -lt 0 || -z $unit_mult ]]; then return; fi
-
-	if ((per_second==1 & unit_mult==1)); then per_second="/s"
-	elif ((per_second==1)); then per_second="ps"; fi
-
-	if ((value>0)); then
-		value=$((value*100*unit_mult))
+	if [[ -z $value || -z $unit_mult ]]; then return; fi
 
-		until ((${#value}<6)); do
-			value=$((value>>10))
-			((++selector))
-		done
+	#* Totals are cached in two generations, when the current is full the previous is cleared and becomes current
+	#* Speeds changes every update and are not cached
+	if [[ -z $per_second ]]; then
+		key="${unit_offset}${selector}:${value}"
+		out="${humanizer_cache_now[${key}]:-${humanizer_cache_prev[${key}]}}"
+	fi
+	if [[ -z $out ]]; then
+		#* Number of steps of 1024 is found from precalculated limits instead of shifting until below 6 digits
+		if ((value>0)); then
+			value=$((value*100*unit_mult))
+			shift=$(( value<humanizer_limit[0] ? 0 : value<humanizer_limit[1] ? 1 : value<humanizer_limit[2] ? 2 : value<humanizer_limit[3] ? 3 : value<humanizer_limit[4] ? 4 : 5 ))
+
+			#* Largest unit is PiB or Pib, bigger values are shown with more digits instead of running into the next unit group
+			if ((selector+shift>5)); then shift=$((5-selector)); fi
+			value=$((value>>(shift*10)))
+			selector=$((selector+shift))
+
+			if ((${#value}<5 & ${#value}>=2 & selector>0)); then
+				decimals=$((5-${#value}))
+				value="${value::-2}.${value:(-${decimals})}"
+			elif ((${#value}>=2)); then
+				value="${value::-2}"
+			fi
+		fi
 
-		if ((${#value}<5 & ${#value}>=2 & selector>0)); then
-			decimals=$((5-${#value}))
-			value="${value::-2}.${value:(-${decimals})}"
-		elif ((${#value}>=2)); then
-			value="${value::-2}"
+		if [[ -n $per_second ]] && ((unit_offset==0)); then per_second="/s"
+		elif [[ -n $per_second ]]; then per_second="ps"; fi
+		out="${value} ${humanizer_units[unit_offset+selector]}${per_second}"
+	fi
+	if [[ -n $key && -z ${humanizer_cache_now[${key}]} ]]; then
+		humanizer_cache_now[${key}]="${out}"
+		if ((${#humanizer_cache_now[@]}>=humanizer_cache_size)); then
+			next="${!humanizer_cache_prev}"
+			humanizer_cache_prev=()
+			declare -gn humanizer_cache_prev="${!humanizer_cache_now}" humanizer_cache_now="${next}"
 		fi
 	fi
 
-	out_var="${value} ${unit[$selector]}${per_second}"
-	if [[ -z $ext_var ]]; then echo -n "${out_var}"; fi
+	if [[ -z $ext_var ]]; then echo -n "${out}"
+	else out_var="${out}"; fi
 }
 
 get_cpu_info() {
@@ -696,6 +878,31 @@ get_cpu_info() {
 	fi
 }
 
+get_users() { #? Read user names from "/etc/passwd" to array "user_names" indexed by uid, unknown uids are shown as numbers
+	local name uid passwd_skip
+
+	#* Stamp is written before reading so any later change to "/etc/passwd" is newer than the stamp
+	if [[ -n ${proc[passwd_stamp]} ]]; then : 2>/dev/null >"${proc[passwd_stamp]}" || unset 'proc[passwd_stamp]'; fi
+
+	user_names=()
+	while IFS=':' read -r name passwd_skip uid passwd_skip; do
+		if is_int "${uid}"; then user_names[${uid}]="${name}"; fi
+	done </etc/passwd
+
+	#* User names are matched by filter, cached results are no longer valid
+	filter_cache=()
+}
+
+format_rate() { #? Shorten a rate to at most 4 characters with "k" or "M" suffix, usage: format_rate <value> <variable-name>
+	local value=$1
+	local -n rate_out=$2
+	if ((value>=10000000)); then rate_out="$((value/1000000))M"
+	elif ((value>=1000000)); then rate_out="$((value/1000000)).$((value%1000000/100000))M"
+	elif ((value>=10000)); then rate_out="$((value/1000))k"
+	elif ((value>=1000)); then rate_out="$((value/1000)).$((value%1000/100))k"
+	else rate_out="${value}"; fi
+}
+
 get_value() { #? Get a value from a file, variable or array by searching for a non spaced "key name" on the same line
 	local match line_pos=1 int reg key all tmp_array input found input_line line_array line_val ext_var line_nr current_line match_key math removing ext_arr
 	local -a remove
@@ -1343,23 +1550,131 @@ print() {	#? Print text, set true-color foreground/background color, add effects
 
 }
 
+update_cpu_set() { #? Set thread count, sockets and frequency files from a list of available cpu ids, history of removed threads is cleared
+	local id thread=0 socket_id i
+	local -A sockets
+
+	for((i=1;i<=cpu[threads];i++)); do unset "cpu_core_history_$i" "cpu_core_graph_$i"; done
+	cpu_ids=(); cpu_thread=(); cpu_socket=(); cpu_freq_path=(); cpu_freq=()
+
+	for id in $1; do
+		((++thread))
+		cpu_ids[thread]=${id}
+		cpu_thread[id]=${thread}
+		socket_id=0
+		read -r socket_id 2>/dev/null </sys/devices/system/cpu/cpu${id}/topology/physical_package_id || true
+		cpu_socket[thread]=${socket_id}
+		sockets[${socket_id}]=1
+		if [[ -r /sys/devices/system/cpu/cpu${id}/cpufreq/scaling_cur_freq ]]; then cpu_freq_path[thread]="/sys/devices/system/cpu/cpu${id}/cpufreq/scaling_cur_freq"; fi
+	done
+	cpu[threads]=${thread}
+	cpu[sockets]=${#sockets[@]}
+	cpu[cpu_ids]="$1"
+
+	#* Find "scaling_cur_freq" files for all cpu threads, fall back to "cpu MHz" lines in "/proc/cpuinfo" if not available
+	unset 'cpu[freq_source]'
+	if ((${#cpu_freq_path[@]}>0)); then cpu[freq_source]="sysfs"
+	elif grep -q "^cpu MHz" /proc/cpuinfo 2>/dev/null; then cpu[freq_source]="cpuinfo"; fi
+
+	#* Samples taken with another set of cpus can't be compared, usage starts over from the next sample
+	cpu_total_old=(); cpu_idle_old=()
+	cpu_usage=("${cpu_usage[0]:-0}")
+	for((i=1;i<=thread;i++)); do cpu_usage[i]=0; done
+
+	#* Box sizes depends on number of threads
+	resized=1
+}
+
 collect_cpu() { #? Collects cpu stats from /proc/stat and compares with previously collected sample to get cpu usage
 				#? Returns cpu usage in array "cpu_usage", index 0 is usage for all threads, following indices corresponds to thread usage in multicore/hyperthreading cpus
-	local stat_array freq thread i threads=${cpu[threads]}
-
-	#* Get values from /proc/stat, compare to get cpu usage
-	thread=0
-	while ((thread<threads+1)) && read -ra stat_array; do
-		cpu[new_${thread}]=$((stat_array[1]+stat_array[2]+stat_array[3]+stat_array[4]))
-		cpu[idle_new_${thread}]=${stat_array[4]}
-		if [[ -n ${cpu[old_${thread}]} && -n ${cpu[idle_new_${thread}]} && ${cpu[old_${thread}]} -ne ${cpu[new_${thread}]} ]]; then 
-			cpu_usage[${thread}]=$(( ( 100*(${cpu[old_${thread}]}-${cpu[new_${thread}]}-${cpu[idle_old_${thread}]}+${cpu[idle_new_${thread}]}) ) / (${cpu[old_${thread}]}-${cpu[new_${thread}]}) ))
-		fi
-		cpu[old_${thread}]=${cpu[new_${thread}]}
-		cpu[idle_old_${thread}]=${cpu[idle_new_${thread}]}
-		((++thread))
+	local stat_array freq thread i threads range
+
+	#* Cpus outside of the cgroup cpuset are skipped, the list is only parsed again if "cpuset.cpus.effective" has changed
+	local stat_key stat_line
+	if [[ -n ${cpu[cpuset_file]} ]]; then
+		stat_line=""
+		read -r stat_line 2>/dev/null <"${cpu[cpuset_file]}" || true
+		if [[ ${stat_line} != "${cpu[cpuset]}" ]]; then
+			cpu[cpuset]="${stat_line}"
+			cpu_allowed=()
+			for range in ${stat_line//,/ }; do
+				for((i=${range%-*};i<=${range#*-};i++)); do cpu_allowed[i]=1; done
+			done
+		fi
+	fi
+
+	#* Read "/proc/stat" in one pass, all time fields for each thread are kept in indexed arrays, idle and iowait counts as idle time
+	#* user, nice, system, idle, iowait, irq, softirq, steal, guest, guest_nice, guest time is already included in user and nice
+	#* Online cpus are the "cpuN" lines, the total is summed from the cpus available to us instead of using the "cpu" line
+	local total idle_all time_diff id stat_ids
+	local -a stat_lines sum_array=(0 0 0 0 0 0 0 0 0 0)
+	while read -r stat_key stat_line; do
+		case ${stat_key} in
+			cpu) ;;
+			cpu*)
+				id=${stat_key#cpu}
+				if [[ -n ${cpu[cpuset]} && -z ${cpu_allowed[id]} ]]; then continue; fi
+				stat_array=(${stat_line} 0 0 0 0 0 0 0 0 0 0)
+				((sum_array[0]+=stat_array[0], sum_array[1]+=stat_array[1], sum_array[2]+=stat_array[2], sum_array[3]+=stat_array[3],
+				sum_array[4]+=stat_array[4], sum_array[5]+=stat_array[5], sum_array[6]+=stat_array[6], sum_array[7]+=stat_array[7],
+				sum_array[8]+=stat_array[8], sum_array[9]+=stat_array[9])) || true
+				stat_lines+=("${stat_array[*]:0:10}")
+				stat_ids+="${id} "
+			;;
+			ctxt|processes|procs_running|procs_blocked) cpu[${stat_key}]=${stat_line};;
+			intr) cpu[intr]=${stat_line%% *};;
+		esac
 	done </proc/stat
 
+	if [[ ${stat_ids} != "${cpu[cpu_ids]}" ]]; then update_cpu_set "${stat_ids}"; fi
+	threads=${cpu[threads]}
+	stat_lines=("${sum_array[*]}" "${stat_lines[@]}")
+
+	for((thread=0;thread<=threads;thread++)); do
+		stat_array=(${stat_lines[thread]})
+		total=$((stat_array[0]+stat_array[1]+stat_array[2]+stat_array[3]+stat_array[4]+stat_array[5]+stat_array[6]+stat_array[7]))
+		idle_all=$((stat_array[3]+stat_array[4]))
+		time_diff=$((total-${cpu_total_old[thread]:-0}))
+
+		if [[ -n ${cpu_total_old[thread]} ]] && ((time_diff>0)); then
+			cpu_usage[thread]=$(( 100*(time_diff-(idle_all-cpu_idle_old[thread]))/time_diff ))
+			if ((cpu_usage[thread]<0)); then cpu_usage[thread]=0; elif ((cpu_usage[thread]>100)); then cpu_usage[thread]=100; fi
+
+			#* Percentage of each time class for cpu total, irq and softirq are counted as system time
+			if ((thread==0)); then
+				cpu[user]=$(( 100*(stat_array[0]+stat_array[1]-cpu_user[0]-cpu_nice[0])/time_diff ))
+				cpu[system]=$(( 100*(stat_array[2]+stat_array[5]+stat_array[6]-cpu_system[0]-cpu_irq[0]-cpu_softirq[0])/time_diff ))
+				cpu[iowait]=$(( 100*(stat_array[4]-cpu_iowait[0])/time_diff ))
+				cpu[steal]=$(( 100*(stat_array[7]-cpu_steal[0])/time_diff ))
+			fi
+		fi
+
+		cpu_user[thread]=${stat_array[0]}; cpu_nice[thread]=${stat_array[1]}; cpu_system[thread]=${stat_array[2]}
+		cpu_idle[thread]=${stat_array[3]}; cpu_iowait[thread]=${stat_array[4]}; cpu_irq[thread]=${stat_array[5]}
+		cpu_softirq[thread]=${stat_array[6]}; cpu_steal[thread]=${stat_array[7]}; cpu_guest[thread]=${stat_array[8]}
+		cpu_guest_nice[thread]=${stat_array[9]}
+		cpu_total_old[thread]=${total}
+		cpu_idle_old[thread]=${idle_all}
+	done
+
+	#* Rates per second for context switches, interrupts and process creations from the counters read above
+	local rate_name elapsed
+	get_ms cpu[new_timestamp]
+	elapsed=$((cpu[new_timestamp]-${cpu[rate_timestamp]:-0}))
+	cpu[rate_timestamp]=${cpu[new_timestamp]}
+	for rate_name in ctxt intr processes; do
+		if [[ -n ${cpu[${rate_name}_old]} ]] && ((elapsed>0)); then
+			cpu[${rate_name}_rate]=$(( (cpu[${rate_name}]-cpu[${rate_name}_old])*1000/elapsed ))
+			local -n rate_history="cpu_rate_history_${rate_name}"
+			if ((${#rate_history[@]}>20)); then
+				rate_history=( "${rate_history[@]:10}" "${cpu[${rate_name}_rate]}")
+			else
+				rate_history+=("${cpu[${rate_name}_rate]}")
+			fi
+		fi
+		cpu[${rate_name}_old]=${cpu[${rate_name}]}
+	done
+
 	#* Copy cpu usage for cpu package and cores to cpu history arrays and trim earlier entries
 	if ((${#cpu_history[@]}>tty_width*2)); then
 		cpu_history=( "${cpu_history[@]:$tty_width}" "${cpu_usage[0]}")
@@ -1368,6 +1683,7 @@ collect_cpu() { #? Collects cpu stats from /proc/stat and compares with previous
 	fi
 
 	for((i=1;i<=threads;i++)); do
+		if [[ -n ${box[cpu_compact]} ]]; then break; fi
 		local -n cpu_core_history="cpu_core_history_$i"
 		if ((${#cpu_core_history[@]}>20)); then
 			cpu_core_history=( "${cpu_core_history[@]:10}" "${cpu_usage[$i]}")
@@ -1376,99 +1692,319 @@ collect_cpu() { #? Collects cpu stats from /proc/stat and compares with previous
 		fi
 	done
 	
-	#* Get current cpu frequency from "/proc/cpuinfo" and convert to appropriate unit
-	if [[ -z ${cpu[no_cpu_info]} ]] && ! get_value -v 'cpu[freq]' -sf "/proc/cpuinfo" -k "cpu MHz" -i; then
-		cpu[no_cpu_info]=1
+	#* Get current frequency in MHz for each thread from the files found at init, "/proc/cpuinfo" is only read if there are none
+	local freq_key freq_min freq_max freq_sum=0 freq_count=0
+	if [[ ${cpu[freq_source]} == "sysfs" ]]; then
+		for i in "${!cpu_freq_path[@]}"; do
+			if read -r freq 2>/dev/null <"${cpu_freq_path[i]}"; then cpu_freq[i]=$((freq/1000)); fi
+		done
+	elif [[ ${cpu[freq_source]} == "cpuinfo" ]]; then
+		i=0
+		while IFS=':' read -r freq_key freq; do
+			freq="${freq// /}"
+			if [[ ${freq_key} == "processor"* ]]; then i=${cpu_thread[freq]:-0}
+			elif [[ ${freq_key} == "cpu MHz"* ]] && ((i>0)); then cpu_freq[i]="${freq%.*}"; fi
+		done </proc/cpuinfo
 	fi
-	
-	#* If getting cpu frequency from "proc/cpuinfo" was unsuccessfull try "/sys/devices/../../scaling_cur_freq"
-	if [[ -n ${cpu[no_cpu_info]} && -e "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq" ]]; then
-		get_value -v 'cpu[freq]' -sf "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq" -i
-		printf -v 'cpu[freq]' "%.0f0" "${cpu[freq]}e-4"
+
+	#* Package frequency is shown as min/avg/max of all threads, or a single value if all are the same
+	if ((${#cpu_freq[@]}>0)); then
+		for i in "${!cpu_freq[@]}"; do
+			if ((i==0)); then continue; fi
+			freq=${cpu_freq[i]}
+			if [[ -z ${freq_min} ]] || ((freq<freq_min)); then freq_min=${freq}; fi
+			if [[ -z ${freq_max} ]] || ((freq>freq_max)); then freq_max=${freq}; fi
+			freq_sum=$((freq_sum+freq)); ((++freq_count))
+		done
+		cpu_freq[0]=$((freq_sum/freq_count))
+		cpu[freq]=${cpu_freq[0]}
+		if ((freq_min==freq_max)); then freq_key="${cpu_freq[0]}"
+		else freq_key="${freq_min} ${cpu_freq[0]} ${freq_max}"; fi
+		if ((freq_max>=1000)); then
+			unset 'cpu[freq_string]'
+			for freq in ${freq_key}; do cpu[freq_string]+="${cpu[freq_string]:+/}$((freq/1000)).$((freq%1000/100))"; done
+			cpu[freq_string]+=" GHz"
+		else
+			cpu[freq_string]="${freq_key// //} MHz"
+		fi
+	else
+		cpu[freq_string]=""
+	fi
+
+	#* Get load average, running and total tasks and last pid from "/proc/loadavg"
+	local load_1 load_5 load_15 tasks uptime_var uptime_skip
+	if read -r load_1 load_5 load_15 tasks cpu[last_pid] 2>/dev/null </proc/loadavg; then
+		cpu[load_avg]="${load_1} ${load_5} ${load_15}"
+		cpu[tasks_running]="${tasks%/*}"
+		cpu[tasks_total]="${tasks#*/}"
 	fi
 
-	if ((${#cpu[freq]}>3)); then cpu[freq_string]="${cpu[freq]::-3}.${cpu[freq]:(-3):1} GHz"
-	elif ((${#cpu[freq]}>1)); then cpu[freq_string]="${cpu[freq]} MHz"
-	else cpu[freq_string]=""; fi
+	#* Get uptime in seconds from "/proc/uptime" and format as [days, ]hh:mm
+	if read -r uptime_var uptime_skip 2>/dev/null </proc/uptime; then
+		uptime_var="${uptime_var%.*}"
+		if ((uptime_var>=172800)); then printf -v 'cpu[uptime]' "%d days, %02d:%02d" "$((uptime_var/86400))" "$((uptime_var%86400/3600))" "$((uptime_var%3600/60))"
+		elif ((uptime_var>=86400)); then printf -v 'cpu[uptime]' "1 day, %02d:%02d" "$((uptime_var%86400/3600))" "$((uptime_var%3600/60))"
+		else printf -v 'cpu[uptime]' "%02d:%02d" "$((uptime_var/3600))" "$((uptime_var%3600/60))"; fi
+	fi
 
-	#* Get load average and uptime from uptime command
-	local uptime_var
-	read -r uptime_var < <(uptime 2>/dev/null || true)
-	cpu[load_avg]="${uptime_var#*average: }"
-	cpu[load_avg]="${cpu[load_avg]//,/}"
-	cpu[uptime]="${uptime_var#*up }"
-	cpu[uptime]="${cpu[uptime]%%,  *}"
+	#* Collect interrupts per cpu if shown
+	if [[ $cpu_irq_view == true ]]; then collect_irqs; fi
+}
 
-	#* Collect cpu temps if enabled
-	if [[ $check_temp == true ]]; then collect_cpu_temps; fi
+collect_irqs() { #? Collect interrupts and softirqs per second for each cpu from "/proc/interrupts" and "/proc/softirqs"
+				#? Returns total per cpu id in array "irq_total" and "rate:name" pairs per cpu id in array "irq_classes"
+	local file header key line name i count elapsed rate
+	local -a fields old
+
+	get_ms irq[new_timestamp]
+	elapsed=$((irq[new_timestamp]-${irq[timestamp]:-0}))
+	irq[timestamp]=${irq[new_timestamp]}
+	irq_total=(); irq_classes=()
+
+	for file in softirqs interrupts; do
+		local -n irq_cols="irq_cols_${file}"
+		{
+			#* Columns are only mapped to cpu ids again if the header changes, old counts are dropped since columns may have moved
+			read -r header
+			if [[ ${header} != "${irq[${file}_header]}" ]]; then
+				irq[${file}_header]="${header}"
+				irq_cols=()
+				for name in ${header}; do irq_cols+=("${name#CPU}"); done
+				for key in "${!irq_old[@]}"; do
+					if [[ ${key} == "${file}:"* ]]; then unset "irq_old[${key}]"; fi
+				done
+			fi
+			count=${#irq_cols[@]}
+
+			#* Lines that hasn't changed since last read are skipped without splitting
+			while read -r key line; do
+				if [[ ${line} == "${irq_old[${file}:${key}]}" ]]; then continue; fi
+				if [[ -n ${irq_old[${file}:${key}]} ]] && ((elapsed>0)); then
+					fields=(${line})
+					old=(${irq_old[${file}:${key}]})
+
+					#* Numbered interrupts are named by the device, the rest by the key
+					if [[ ${key} == +([0-9]): ]]; then name="${fields[-1]}"; else name="${key%:}"; fi
+
+					for((i=0;i<count;i++)); do
+						if ((fields[i]>old[i])); then
+							rate=$(( (fields[i]-old[i])*1000/elapsed ))
+							irq_total[irq_cols[i]]=$(( ${irq_total[irq_cols[i]]:-0}+rate ))
+							irq_classes[irq_cols[i]]+="${rate}:${name} "
+						fi
+					done
+				fi
+				irq_old[${file}:${key}]="${line}"
+			done
+		} </proc/${file}
+	done
 }
 
-collect_cpu_temps() { #? Collect cpu temperatures
-	local unit i it c div threads=${cpu[threads]} sens_var
+get_temp_sources() { #? Find cpu temperature sensors in "/sys/class/hwmon" or "/sys/class/thermal", labels and high/crit values are only read here
+	local hwmon chip input base label fallback value zone zone_type trip trip_type core_id
+	local -a core_inputs
+	unset 'cpu_temp_path[@]' 'cpu[temp_high]' 'cpu[temp_crit]' 'cpu[temp_cores]'
+
+	#* Package sensor is "Package id N" for intel, "Tdie" or "Tctl" for amd, first sensor of chip if no known label, core sensors are "Core N"
+	for hwmon in /sys/class/hwmon/hwmon*; do
+		chip=""
+		read -r chip 2>/dev/null <"${hwmon}/name" || true
+		case ${chip} in
+			coretemp|k10temp|zenpower|cpu_thermal|cpu-thermal|soc_thermal) ;;
+			*) continue;;
+		esac
+		for input in "${hwmon}"/temp*_input; do
+			if [[ ! -r ${input} ]]; then continue; fi
+			base="${input%_input}"; label=""
+			read -r label 2>/dev/null <"${base}_label" || true
+			case ${label} in
+				"Package id"*|"Tctl") if [[ -z ${cpu_temp_path[0]} ]]; then cpu_temp_path[0]="${input}"; fi;;
+				"Tdie") cpu_temp_path[0]="${input}";;
+				"Core "*)
+					#* Inputs are kept in order of core id since glob order is lexical, with several sockets the first one found is used
+					core_id="${label#Core }"
+					if is_int "${core_id}" && [[ -z ${core_inputs[core_id]} ]]; then core_inputs[core_id]="${input}"; fi
+				;;
+				*) if [[ -z ${fallback} ]]; then fallback="${input}"; fi;;
+			esac
+		done
+	done
+	if [[ -z ${cpu_temp_path[0]} && -n ${fallback} ]]; then cpu_temp_path[0]="${fallback}"; fi
+
+	if [[ -n ${cpu_temp_path[0]} ]]; then
+		base="${cpu_temp_path[0]%_input}"
+		if read -r value 2>/dev/null <"${base}_max" && ((value>0)); then cpu[temp_high]=$((value/1000)); fi
+		if read -r value 2>/dev/null <"${base}_crit" && ((value>0)); then cpu[temp_crit]=$((value/1000)); fi
+		if ((${#core_inputs[@]}>0)); then
+			cpu_temp_path+=("${core_inputs[@]}")
+			cpu[temp_cores]=${#core_inputs[@]}
+		fi
 
-	#* Fetch output from "sensors" command to a variable
-	sens_var="$(sensors)"
+	#* If no hwmon sensor was found use first thermal zone of cpu or soc type, high and crit values are taken from trip points
+	else
+		for zone in /sys/class/thermal/thermal_zone*; do
+			zone_type=""
+			read -r zone_type 2>/dev/null <"${zone}/type" || true
+			case ${zone_type} in
+				x86_pkg_temp|*cpu*|*CPU*|*soc*) ;;
+				*) continue;;
+			esac
+			if [[ ! -r ${zone}/temp ]]; then continue; fi
+			cpu_temp_path[0]="${zone}/temp"
+			for trip in "${zone}"/trip_point_*_type; do
+				trip_type=""
+				read -r trip_type 2>/dev/null <"${trip}" || true
+				if ! read -r value 2>/dev/null <"${trip%_type}_temp" || ((value<=0)); then continue; fi
+				case ${trip_type} in
+					critical) cpu[temp_crit]=$((value/1000));;
+					hot|passive) if [[ -z ${cpu[temp_high]} ]]; then cpu[temp_high]=$((value/1000)); fi;;
+				esac
+			done
+			break
+		done
+	fi
+
+	if [[ -z ${cpu_temp_path[0]} ]]; then return 1; fi
+
+	#* Use default values if sensor doesn't have any, high temp is used as 100% for temperature graphs
+	if [[ -z ${cpu[temp_high]} ]]; then
+		if [[ -n ${cpu[temp_crit]} ]] && ((cpu[temp_crit]>35)); then cpu[temp_high]=$((cpu[temp_crit]-10)); else cpu[temp_high]=85; fi
+	fi
+	if ((cpu[temp_high]<=15)); then cpu[temp_high]=85; fi
+	cpu[temp_crit]=${cpu[temp_crit]:-$((cpu[temp_high]+15))}
+	cpu[temp_unit]="°C"
+}
+
+collect_cpu_temps() { #? Collect cpu temperatures from sensor files found at init
+	local i it value threads=${cpu[threads]} cores=${cpu[temp_cores]:-0}
+
+	#* Get cpu package temp, turn off temperature checking if not available
+	if [[ -z ${cpu_temp_path[0]} ]] || ! read -r value 2>/dev/null <"${cpu_temp_path[0]}"; then
+		check_temp="false"
+		return
+	fi
+	cpu[temp_0]=$((value/1000))
 
-	#* Get CPU package temp
-	if get_value -v 'cpu[temp_0]' -sv "sens_var" -k "Package*:" -mk 1; then
+	#* Threads without own core sensor shares temp with core "thread number modulo number of core sensors", package temp if no core sensors
+	for((it=1;it<=threads;it++)); do
+		if ((it<=cores)) && read -r value 2>/dev/null <"${cpu_temp_path[it]}"; then cpu[temp_${it}]=$((value/1000))
+		elif ((cores>0 & it>cores)); then cpu[temp_${it}]=${cpu[temp_$(( (it-1)%cores+1 ))]}
+		else cpu[temp_${it}]=${cpu[temp_0]}; fi
+	done
 
-		#* If successful get temperature unit, convert temp to integer and get high, crit and core temps
-		cpu[temp_unit]=${cpu[temp_0]:(-2)}; cpu[temp_0]=${cpu[temp_0]%.*}; if [[ ${cpu[temp_0]::1} == "+" ]]; then cpu[temp_0]=${cpu[temp_0]#+}; fi
-		if [[ -z ${cpu[temp_high]} ]]; then 
-			get_value -v 'cpu[temp_high]' -sv "sens_var" -k "Package*high =" -m 2 -r "[^0-9.]" -b -i
-			get_value -v 'cpu[temp_crit]' -sv "sens_var" -k "Package*crit =" -m 2 -r "[^0-9.]" -b -i
+	for((i=0;i<=threads;i++)); do
+		local -n cpu_temp_history="cpu_temp_history_$i"
+		if ((${#cpu_temp_history[@]}>15)); then
+			cpu_temp_history=( "${cpu_temp_history[@]:10}" "$(( (${cpu[temp_${i}]}-15)*100/(cpu[temp_high]-15) ))")
+		else
+			cpu_temp_history+=("$(( (${cpu[temp_${i}]}-15)*100/(cpu[temp_high]-15) ))")
 		fi
-		for((i=0,it=1;i<threads;i++,it++)); do
-			if ! get_value -v "cpu[temp_${it}]" -sv "sens_var" -k "Core ${i}:" -mk 1 -r "[^0-9.-]" -b -i; then break; fi
-			#* If number of cores is less than number of threads copy current temp to "current core id"+"total cores"
-			if ((cpu[cores]<cpu[threads])); then
-				cpu[temp_$((it+cpu[cores]))]=${cpu[temp_${it}]}
+	done
+}
+
+collect_pressure() { #? Collect pressure stall information from "/proc/pressure/", time stalled since last sample is saved as percent
+	local resource type avg10 avg60 avg300 total elapsed
+
+	get_ms psi[new_timestamp]
+	elapsed=$((psi[new_timestamp]-${psi[timestamp]:-0}))
+	psi[timestamp]=${psi[new_timestamp]}
+
+	#* Lines are "some" and "full" followed by averages and total stall time in microseconds
+	for resource in cpu memory io; do
+		while read -r type avg10 avg60 avg300 total; do
+			total=${total#total=}
+			if [[ -n ${psi[${resource}_${type}_total]} ]] && ((elapsed>0)); then
+				psi[${resource}_${type}]=$(( (total-psi[${resource}_${type}_total]+elapsed*5)/(elapsed*10) ))
+				if ((psi[${resource}_${type}]>100)); then psi[${resource}_${type}]=100; fi
+			else
+				psi[${resource}_${type}]=0
 			fi
-		done
+			psi[${resource}_${type}_total]=${total}
 
-		for((i=0;i<=threads;i++)); do
-			local -n cpu_temp_history="cpu_temp_history_$i"
-			if ((${#cpu_temp_history[@]}>15)); then
-				cpu_temp_history=( "${cpu_temp_history[@]:10}" "$(( (${cpu[temp_${i}]}-15)*100/(cpu[temp_high]-15) ))")
+			local -n psi_history="psi_history_${resource}_${type}"
+			if ((${#psi_history[@]}>tty_width)); then
+				psi_history=( "${psi_history[@]:$((tty_width/2))}" "${psi[${resource}_${type}]}")
 			else
-				cpu_temp_history+=("$(( (${cpu[temp_${i}]}-15)*100/(cpu[temp_high]-15) ))")
+				psi_history+=("${psi[${resource}_${type}]}")
 			fi
-		done
-		
+		done 2>/dev/null </proc/pressure/${resource} || true
+	done
+}
 
-	#* If unsuccessful turn off temperature checking
-	else
-		check_temp="false"
-	fi
+collect_diskio() { #? Collect read and write speed, operations per second and average wait for shown disks from "/proc/diskstats"
+	local major minor name reads reads_merged read_sectors read_ms writes writes_merged write_sectors write_ms io_skip dev elapsed ios
+	local -A wanted
+
+	for dev in "${disks_io_dev[@]}"; do wanted[${dev}]=1; done
+	if ((${#wanted[@]}==0)); then return; fi
+
+	get_ms diskio[new_timestamp]
+	elapsed=$((diskio[new_timestamp]-${diskio[timestamp]:-0}))
+	diskio[timestamp]=${diskio[new_timestamp]}
+
+	#* Sectors are always 512 bytes in "/proc/diskstats", wait is time spent on reads and writes divided by number of operations
+	while read -r major minor name reads reads_merged read_sectors read_ms writes writes_merged write_sectors write_ms io_skip; do
+		dev="${major}:${minor}"
+		if [[ -z ${wanted[${dev}]} ]]; then continue; fi
+		if [[ -n ${diskio[${dev}_reads]} ]] && ((elapsed>0)); then
+			diskio[${dev}_read_bps]=$(( (read_sectors-diskio[${dev}_read_sectors])*512*1000/elapsed ))
+			diskio[${dev}_write_bps]=$(( (write_sectors-diskio[${dev}_write_sectors])*512*1000/elapsed ))
+			ios=$((reads-diskio[${dev}_reads]+writes-diskio[${dev}_writes]))
+			diskio[${dev}_iops]=$((ios*1000/elapsed))
+			if ((ios>0)); then diskio[${dev}_await]=$(( (read_ms-diskio[${dev}_read_ms]+write_ms-diskio[${dev}_write_ms])/ios ))
+			else diskio[${dev}_await]=0; fi
+
+			local -n io_history="diskio_history_${major}_${minor}"
+			if ((${#io_history[@]}>tty_width)); then
+				io_history=( "${io_history[@]:$((tty_width/2))}" "$((diskio[${dev}_read_bps]+diskio[${dev}_write_bps]))")
+			else
+				io_history+=("$((diskio[${dev}_read_bps]+diskio[${dev}_write_bps]))")
+			fi
+		fi
+		diskio[${dev}_reads]=${reads}; diskio[${dev}_read_sectors]=${read_sectors}; diskio[${dev}_read_ms]=${read_ms}
+		diskio[${dev}_writes]=${writes}; diskio[${dev}_write_sectors]=${write_sectors}; diskio[${dev}_write_ms]=${write_ms}
+	done </proc/diskstats
 }
 
 collect_mem() { #? Collect memory information from "/proc/meminfo"
-	((++mem[counter]))
-
-	if ((mem[counter]<5)); then return; fi
-	mem[counter]=0
-
-	local i tmp value array mem_info
+	local i tmp value array mem_key mem_value mem_unit field
 	local -a mem_array swap_array available=("mem")
 
-	#* Get memory and swap information from "/proc/meminfo" and calculate percentages
-	mem_info="$(</proc/meminfo)"
-	
-	get_value -v 'mem[total]' -sv "mem_info" -k "MemTotal:" -i
-	get_value -v 'mem[available]' -sv "mem_info" -k "MemAvailable:" -i
+	#* Read "/proc/meminfo" in one pass to map "meminfo" with field names as keys and values in KiB
+	meminfo=()
+	while read -r mem_key mem_value mem_unit; do
+		meminfo[${mem_key%:}]=${mem_value}
+	done </proc/meminfo
+
+	#* Get memory and swap information from map and calculate percentages
+	mem[total]=${meminfo[MemTotal]}
+	mem[available]=${meminfo[MemAvailable]:-${meminfo[MemFree]}}
 	mem[available_percent]=$((mem[available]*100/mem[total]))
 	
 	mem[used]=$((mem[total]-mem[available]))
 	mem[used_percent]=$((mem[used]*100/mem[total]))
 	
-	get_value -v 'mem[free]' -sv "mem_info" -k "MemFree:" -i
+	mem[free]=${meminfo[MemFree]}
 	mem[free_percent]=$((mem[free]*100/mem[total]))
 	
-	get_value -v 'mem[cached]' -sv "mem_info" -k "Cached:" -i
+	mem[cached]=${meminfo[Cached]}
 	mem[cached_percent]=$((mem[cached]*100/mem[total]))
 
-	if [[ -n $swap_on ]] && get_value -v swap[total] -sv "mem_info" -k "SwapTotal:" -i && ((swap[total]>0)); then
-		get_value -v 'swap[free]' -sv "mem_info" -k "SwapFree:" -i
+	#* Extra fields are shown as percent of total memory, except committed memory which is shown as percent of the commit limit
+	for field in ${mem_fields}; do
+		if [[ -z ${meminfo[${field}]} ]]; then continue; fi
+		if [[ ${field} == "Committed_AS" ]] && ((${meminfo[CommitLimit]:-0}>0)); then
+			mem[${field}_percent]=$((meminfo[${field}]*100/meminfo[CommitLimit]))
+		else
+			mem[${field}_percent]=$((meminfo[${field}]*100/mem[total]))
+		fi
+		if ((mem[${field}_percent]>100)); then mem[${field}_percent]=100; fi
+		floating_humanizer -v "mem[${field}_string]" -s 1 -B "${meminfo[${field}]}"
+	done
+
+	swap[total]=${meminfo[SwapTotal]:-0}
+	if [[ -n $swap_on ]] && ((swap[total]>0)); then
+		swap[free]=${meminfo[SwapFree]}
 		swap[free_percent]=$((swap[free]*100/swap[total]))
 		
 		swap[used]=$((swap[total]-swap[free]))
@@ -1487,274 +2023,595 @@ collect_mem() { #? Collect memory information from "/proc/meminfo"
 			floating_humanizer -v this_string -s 1 -B "${this_value}"
 		done
 	done
+}
 
-	#* Get disk information from "df" command
-	local df_array df_line line_array
-	unset 'disks_free[@]' 'disks_used[@]' 'disks_used_percent[@]' 'disks_total[@]' 'disks_name[@]' 'disks_free_percent[@]'
-	readarray -t df_array < <(df -x squashfs -x tmpfs -x devtmpfs -x overlay)
-	for df_line in "${df_array[@]:1}"; do
-		line_array=(${df_line})
+get_mounts() { #? Read mount points of filesystems with disk usage from "/proc/self/mountinfo" to array "disks_mount", returns 1 if unchanged since last read
+	local mount_info mount_id parent_id dev root mount_point mount_line fs_type i
+	local -A dev_index
 
-		if [[ ${line_array[5]} == "/" ]]; then disks_name+=("root")
-		else disks_name+=("${line_array[5]##*/}"); fi
-		disks_total+=("$(floating_humanizer -s 1 -B ${line_array[1]})")
-		disks_used+=("$(floating_humanizer -s 1 -B ${line_array[2]})")
-		disks_used_percent+=("${line_array[4]%'%'}")
-		disks_free+=("$(floating_humanizer -s 1 -B ${line_array[3]})")
-		disks_free_percent+=("$((100-${line_array[4]%'%'}))")
+	read -r -d '' mount_info </proc/self/mountinfo || true
+	if [[ ${mount_info} == "${mem[mountinfo]}" ]]; then return 1; fi
+	mem[mountinfo]="${mount_info}"
 
+	#* Same device mounted in several places, like bind mounts, is only shown once with the shortest mount point
+	disks_mount=(); disks_dev=()
+	while read -r mount_id parent_id dev root mount_point mount_line; do
+		fs_type="${mount_line#* - }"; fs_type="${fs_type%% *}"
+		case ${fs_type} in
+			squashfs|tmpfs|devtmpfs|overlay|proc|sysfs|devpts|cgroup|cgroup2|pstore|bpf|securityfs|debugfs|tracefs|mqueue|hugetlbfs|configfs|fusectl|binfmt_misc|autofs|nsfs|rpc_pipefs|efivarfs|ramfs|selinuxfs) continue;;
+		esac
+		printf -v mount_point '%b' "${mount_point}"
+		if [[ -n ${dev_index[${dev}]} ]]; then
+			i=${dev_index[${dev}]}
+			if ((${#mount_point}<${#disks_mount[i]})); then disks_mount[i]="${mount_point}"; fi
+			continue
+		fi
+		dev_index[${dev}]=${#disks_mount[@]}
+		disks_mount+=("${mount_point}")
+		disks_dev+=("${dev}")
+	done <<<"${mount_info}"
+
+	#* Forget "df" results for filesystems no longer mounted
+	local -A mounted
+	for mount_point in "${disks_mount[@]}"; do mounted[${mount_point}]=1; done
+	for mount_point in "${!disk_df[@]}"; do
+		if [[ -z ${mounted[${mount_point}]} ]]; then unset 'disk_df[${mount_point}]'; fi
 	done
+}
 
+collect_disks() { #? Get disk usage from "df" running in the background, output is read when ready so a hanging filesystem can't stall updates
+	local df_fs df_total df_used df_free df_percent df_mount df_status now shown mount wait_time=0.001
+	local -a df_mounts
 
+	get_ms now
+	get_mounts || true
+	unset 'mem[df_updated]'
 
+	#* Only disks that fits in the memory box is asked for, all of them if sizes hasn't been calculated yet
+	if ((${box[mem_height]:-0}>2)); then shown=$(( (box[mem_height]-2)/2 )); else shown=${#disks_mount[@]}; fi
+	df_mounts=("${disks_mount[@]::shown}")
+
+	#* Start "df" if not already running, wait for it at start to have something to show
+	if [[ -z ${df_fd} && ${#df_mounts[@]} -gt 0 ]]; then
+		mem[df_last]=${now}
+		exec {df_fd}< <(${mem[df_timeout]} df -kP -- "${df_mounts[@]}" 2>/dev/null)
+		if [[ $1 == "init" ]]; then wait_time=2; fi
+	fi
+
+	#* Read any lines available, a read timing out means "df" isn't done yet, results are saved by mount point
+	if [[ -n ${df_fd} ]]; then
+		while true; do
+			if read -r -t ${wait_time} -u ${df_fd} df_fs df_total df_used df_free df_percent df_mount; then
+				if [[ ${df_fs} == "Filesystem" || -z ${df_mount} ]]; then continue; fi
+				disk_df[${df_mount}]="${df_total} ${df_used} ${df_free} ${df_percent%'%'}"
+				mem[df_updated]=1
+			else
+				df_status=$?
+				break
+			fi
+		done
+
+		#* Close when done, or give up on it if it has been running for much longer than the timeout
+		if ((df_status<=128 | now-mem[df_last]>10000)); then
+			exec {df_fd}<&-
+			unset df_fd
+		fi
+	fi
+
+	#* Humanize values for disks with results
+	local i=0 j
+	local -a values
+	disks_name=(); disks_total=(); disks_used=(); disks_used_percent=(); disks_free=(); disks_free_percent=(); disks_io_dev=()
+	for j in "${!df_mounts[@]}"; do
+		mount="${df_mounts[j]}"
+		if [[ -z ${disk_df[${mount}]} ]]; then continue; fi
+		disks_io_dev[i]="${disks_dev[j]}"
+		values=(${disk_df[${mount}]})
+		if [[ ${mount} == "/" ]]; then disks_name[i]="root"
+		else disks_name[i]="${mount##*/}"; fi
+		floating_humanizer -v "disks_total[${i}]" -s 1 -B ${values[0]}
+		floating_humanizer -v "disks_used[${i}]" -s 1 -B ${values[1]}
+		floating_humanizer -v "disks_free[${i}]" -s 1 -B ${values[2]}
+		disks_used_percent[i]=${values[3]}
+		disks_free_percent[i]=$((100-values[3]))
+		((++i))
+	done
 }
 
-collect_processes() { #? Collect process information and calculate accurate cpu usage
-	local argument="$1"
-	if [[ -n $skip_process_draw && $argument != "now" ]]; then return; fi
-	local width=${box[processes_width]} height=${box[processes_height]} format_args format_cmd readline sort symbol="▼" cpu_title options pid_string tmp selected
-	local -a grep_array
+scan_processes() { #? Walk "/proc/[pid]" once and update the process table used by the process list and cpu calculations
+	local pid status_skip i j
+	local -a prev_list=("${pid_list[@]}")
 
-	if [[ $argument == "now" ]]; then skip_process_draw=1; fi
+	pid_list=()
 
-	if [[ -n ${proc[reverse]} ]]; then symbol="▲"; fi
-	case ${proc_sorting} in
-		"pid") selected="Pid:"; sort="pid";;
-		"program") selected="Program:"; sort="comm";;
-		"arguments") selected="Arguments:"; sort="args";;
-		"threads") selected="Threads:"; sort="nlwp";;
-		"user") selected="User:"; sort="euser";;
-		"memory") selected="Mem%"; sort="pmem";;
-		"cpu lazy"|"cpu responsive") sort="pcpu"; selected="Cpu%";;
-	esac
+	#* Reload user names only if "/etc/passwd" has been modified
+	if [[ -n ${proc[passwd_stamp]} && /etc/passwd -nt ${proc[passwd_stamp]} ]]; then get_users; fi
 
+	#* Get uptime in clock ticks to compare with process start times
+	read -r proc[uptime] status_skip </proc/uptime
+	proc[uptime_ticks]=$(( 10#${proc[uptime]/./}*cpu[hz]/100 ))
 
-	#* Collect output from ps command to array
-	if ((width>60)); then format_args=",args:$(( width-(47+proc[pid_len]) ))=Arguments:"; format_cmd=15
-	else format_cmd=$(( width-(31+proc[pid_len]) )); fi
-	unset 'proc_array[@]' 'pid_array[@]'
+	#* Timestamp the values in milliseconds to accurately calculate cpu usage
+	get_ms proc[new_timestamp]
+	proc[read_timestamp]=${proc[new_timestamp]}
 
-	if ((proc[detailed]==0)) && [[ -n ${proc[detailed_name]} ]]; then
-		unset 'proc[detailed_name]' 'proc[detailed_killed]' 'proc[detailed_cpu_int]' 'proc[detailed_cmd]'
-		unset 'proc[detailed_mem]' 'proc[detailed_mem_int]' 'proc[detailed_user]' 'proc[detailed_threads]'
-		unset 'detail_graph[@]' 'detail_mem_graph' 'detail_history[@]' 'detail_mem_history[@]'
-		unset 'proc[detailed_runtime]' 'proc[detailed_mem_string]' 'proc[detailed_parent_pid]' 'proc[detailed_parent_name]'
-	fi
+	for pid in ${proc[scan_glob]}; do
+		pid="${pid#/proc/}"
+		#* In windowed mode only new processes are read here, the rest is read when shown or while waiting for next update
+		if [[ $proc_windowed == true && -n ${pid_start[${pid}]} ]]; then pid_list+=("${pid}"); continue; fi
+		if read_process "${pid}"; then pid_list+=("${pid}"); fi
+	done
+	proc[backfill_left]=${#pid_list[@]}
+
+	#* Both scans are in numerical order, walk them side by side to find pids that are gone and free everything stored for them
+	for ((i=0,j=0;i<${#prev_list[@]};i++)); do
+		while ((j<${#pid_list[@]} && pid_list[j]<prev_list[i])); do ((++j)); done
+		if ((j<${#pid_list[@]} && pid_list[j]==prev_list[i])); then continue; fi
+		pid="${prev_list[i]}"
+		unset "pid_comm[${pid}]" "pid_state[${pid}]" "pid_ppid[${pid}]" "pid_ticks[${pid}]" "pid_threads[${pid}]"
+		unset "pid_rss[${pid}]" "pid_start[${pid}]" "pid_args[${pid}]" "pid_uid[${pid}]"
+		unset "pid_old_ticks[${pid}]" "pid_old_time[${pid}]" "filter_cache[${pid}]" "cpu_percent[${pid}]"
+		pid_graph_free "${pid}"
+	done
+}
 
-	unset 'proc[detailed_cpu]'
+read_process() { #? Read "/proc/[pid]/stat" into the process table and calculate cpu usage since last read, usage: read_process <pid>
+	local pid="$1" stat_line comm status_key euid status_skip time_elapsed elapsed
+	local -a stat_array cmdline_array
+
+	if ! read -r stat_line 2>/dev/null <"/proc/${pid}/stat"; then return 1; fi
 
-	if [[ -z $filter ]]; then
-	 	options="-t"
+	#* Program name is enclosed in parentheses and can contain spaces, split remaining fields after it
+	comm="${stat_line#*"("}"; comm="${comm%")"*}"; comm="${comm//[[:cntrl:]]/?}"
+	stat_array=(${stat_line##*") "})
+
+	#* A changed start time is a new process on a recycled pid, previous values can't be compared with
+	if [[ -n ${pid_start[${pid}]} && ${pid_start[${pid}]} != "${stat_array[19]}" ]]; then
+		unset "pid_old_ticks[${pid}]" "pid_old_time[${pid}]"
+		pid_graph_free "${pid}"
 	fi
 
-	readarray ${options} proc_array < <(ps ax -o pid:${proc[pid_len]}=Pid:,comm:${format_cmd}=Program:${format_args},nlwp:3=Tr:,euser:6=User:,pmem=Mem%,pcpu:10=Cpu% --sort ${proc[reverse]:--}${sort})
-	
-	proc_array[0]="${proc_array[0]/      Tr:/ Threads:}"
-	proc_array[0]="${proc_array[0]/ ${selected}/${symbol}${selected}}"
+	#* Only read arguments and user for new processes or if program has changed since last read
+	if [[ ${pid_start[${pid}]} != "${stat_array[19]}" || ${pid_comm[${pid}]} != "${comm}" ]]; then
+		cmdline_array=()
+		mapfile -d '' -t cmdline_array 2>/dev/null <"/proc/${pid}/cmdline" || true
+		pid_args[${pid}]="${cmdline_array[*]}"
+		unset "filter_cache[${pid}]"
+		pid_args[${pid}]="${pid_args[${pid}]//[[:cntrl:]]/?}"
+		pid_uid[${pid}]="?"
+		while read -r status_key status_skip euid status_skip; do
+			if [[ ${status_key} == "Uid:" ]]; then pid_uid[${pid}]="${euid}"; break; fi
+		done 2>/dev/null <"/proc/${pid}/status" || true
+	fi
 
-	if [[ -n $filter ]]; then
-		grep_array[0]="${proc_array[0]}"
-	 	readarray -O 1 -t grep_array < <(echo -e " ${proc_array[*]:1}" | grep -e "${filter}" ${proc[detailed_pid]:+-e ${proc[detailed_pid]}} | cut -c 2- || true)
-		proc_array=("${grep_array[@]}")
+	pid_comm[${pid}]="${comm}"
+	pid_state[${pid}]="${stat_array[0]}"
+	pid_ppid[${pid}]="${stat_array[1]}"
+	pid_ticks[${pid}]=$((stat_array[11]+stat_array[12]))
+	pid_threads[${pid}]="${stat_array[17]}"
+	pid_start[${pid}]="${stat_array[19]}"
+	pid_rss[${pid}]="${stat_array[21]}"
+
+	if [[ -n ${pid_old_ticks[${pid}]} ]]; then
+		time_elapsed=$((proc[read_timestamp]-${pid_old_time[${pid}]}))
+		if ((time_elapsed<1)); then time_elapsed=1; fi
+
+		#* Calculate current cpu usage for process, * 1000 (for conversion from ms to seconds) * 1000 (for conversion to floating point)
+		cpu_percent[${pid}]=$(( ( ( ${pid_ticks[${pid}]}-${pid_old_ticks[${pid}]} ) * 1000 * 1000 ) / ( cpu[hz]*time_elapsed*cpu[threads] ) ))
+	else
+		#* No previous value yet, use cpu usage over process lifetime
+		elapsed=$((proc[uptime_ticks]-${pid_start[${pid}]}))
+		if ((elapsed<1)); then elapsed=1; fi
+		cpu_percent[${pid}]=$(( ${pid_ticks[${pid}]}*1000/(elapsed*cpu[threads]) ))
 	fi
 
-	proc[pages]=$(( (${#proc_array[@]}-1)/(height-3)+1 ))
-	if ((proc[page]>proc[pages])); then proc[page]=${proc[pages]}; fi
+	if ((cpu_percent[${pid}]<0)); then cpu_percent[${pid}]=0
+	elif ((cpu_percent[${pid}]>1000)); then cpu_percent[${pid}]=1000; fi
 
+	pid_old_ticks[${pid}]=${pid_ticks[${pid}]}
+	pid_old_time[${pid}]=${proc[read_timestamp]}
+}
 
-	#* Get accurate cpu usage by fetching and comparing values in /proc/"pid"/stat
-	local operations operation utime stime count time_elapsed cpu_percent_string rgb=231 step add proc_out tmp_value_array i pcpu_usage cpu_int tmp_percent breaking
-	local -a cpu_percent statfile work_array
+pid_graph_slot() { #? Get slot in mini graph pool for a pid, replaces graph shown longest ago if pool is full, usage: pid_graph_slot <pid> <output variable>
+	local pid="$1" slot_i slot_oldest
+	local -n slot_out="$2"
 
-	#* Timestamp the values in milliseconds to accurately calculate cpu usage
-	get_ms proc[new_timestamp]
-	
-	for readline in "${proc_array[@]:1}"; do
-		 ((++count))
+	if [[ -n ${graph_slot[${pid}]} ]]; then slot_out=${graph_slot[${pid}]}; return; fi
 
-		if ((count==height-3)); then
-			if [[ -n $filter || $proc_sorting == "cpu responsive" || ${proc[selected]} -gt 0 || ${proc[page]} -gt 1 || ${proc_reversed} == true ]]; then :
-			else breaking=1; fi
-		fi
+	for ((slot_i=0;slot_i<proc_graph_max;slot_i++)); do
+		if [[ -z ${graph_pool_pid[slot_i]} ]]; then slot_oldest=${slot_i}; break; fi
+		if [[ -z ${slot_oldest} ]] || ((graph_pool_used[slot_i]<graph_pool_used[slot_oldest])); then slot_oldest=${slot_i}; fi
+	done
 
-		if get_key -save && [[ ${#saved_key[@]} -gt 0 ]]; then return; fi
+	if [[ -n ${graph_pool_pid[slot_oldest]} ]]; then pid_graph_free "${graph_pool_pid[slot_oldest]}"; fi
 
-		work_array=(${readline})
+	graph_slot[${pid}]=${slot_oldest}
+	graph_pool_pid[slot_oldest]=${pid}
+	graph_pool_used[slot_oldest]=${proc[graph_tick]}
+	slot_out=${slot_oldest}
+}
 
-		pid="${work_array[0]}"
-		pcpu_usage="${work_array[-1]}"
+pid_graph_free() { #? Free slot in mini graph pool used by a pid, usage: pid_graph_free <pid>
+	local slot="${graph_slot[$1]}"
+	if [[ -z ${slot} ]]; then return; fi
+	unset "graph_slot[$1]" "graph_pool[${slot}]" "graph_pool_count[${slot}]" "graph_pool_pid[${slot}]" "graph_pool_used[${slot}]"
+}
 
+backfill_processes() { #? Read processes not read since last update in windowed mode, stops after about 50ms to keep input responsive
+	local pid low=0 high=${#pid_list[@]} mid count=0 time_start time_now
 
-		if [[ ! ${pid_history[*]} =~ ${pid} ]]; then
-			pid_history+=("${pid}")
-		fi
+	get_ms time_start
+	proc[read_timestamp]=${time_start}
 
-		if [[ -n $filter || $proc_sorting == "cpu responsive" ]] && [[ ${proc_array[count]:${proc[pid_len]}:1} != " " ]]; then
-			unset pid_string
-			printf -v pid_string "%${proc[pid_len]}s" "${pid}"
-			proc_array[count]="${pid_string}${proc_array[count]#*${pid}}"
+	#* Continue after last pid read, pid list is in numerical order
+	while ((low<high)); do
+		mid=$(( (low+high)/2 ))
+		if ((pid_list[mid]<=proc[backfill_pid])); then low=$((mid+1)); else high=${mid}; fi
+	done
+
+	while ((proc[backfill_left]>0)); do
+		if ((low>=${#pid_list[@]})); then low=0; fi
+		pid="${pid_list[low++]}"
+		((--proc[backfill_left])) || true
+		proc[backfill_pid]=${pid}
+		if ((${pid_old_time[${pid}]:-0}<proc[new_timestamp])); then read_process "${pid}" || true; fi
+		if ((++count%32==0)); then
+			get_ms time_now
+			if ((time_now-time_start>=50)); then break; fi
 		fi
+	done
 
-		if [[ -r "/proc/${pid}/stat" ]] && read -ra statfile </proc/${pid}/stat 2>/dev/null; then
+	#* Time spent is added to the time used by the next process list update when checking against the cpu budget
+	get_ms time_now
+	proc[backfill_ms]=$(( ${proc[backfill_ms]:-0}+time_now-time_start ))
+}
 
-			utime=${statfile[13]}
-			stime=${statfile[14]}
-			
-			proc[new_${pid}_ticks]=$((utime+stime))
-		
+sort_processes() { #? Order pids from the process table by current sorting, usage: sort_processes "output array"
+	local -n sort_out="$1"
+	local sort_pid sort_key sort_elapsed i j
+	local -a sort_buckets sort_order sort_new sort_merged
+	local -A sort_text
 
-			if [[ -n ${proc[old_${pid}_ticks]} ]]; then
+	#* Numeric values are used as index in a sparse array, which bash returns in ascending order
+	case ${proc_sorting} in
+		"pid") sort_order=("${pid_list[@]}");;
+		"threads")
+			for sort_pid in "${pid_list[@]}"; do
+				sort_buckets[${pid_threads[${sort_pid}]}]+="${sort_pid} "
+			done
+		;;
+		"memory")
+			for sort_pid in "${pid_list[@]}"; do
+				sort_buckets[$(( ${pid_rss[${sort_pid}]}*proc[page_kb]*10000/mem[total] ))]+="${sort_pid} "
+			done
+		;;
+		"cpu lazy"|"cpu responsive")
+			for sort_pid in "${pid_list[@]}"; do
+				sort_elapsed=$((proc[uptime_ticks]-${pid_start[${sort_pid}]}))
+				if ((sort_elapsed<1)); then sort_elapsed=1; fi
+				sort_buckets[$(( ${pid_ticks[${sort_pid}]}*1000/sort_elapsed ))]+="${sort_pid} "
+			done
+		;;
+		"program")
+			for sort_pid in "${pid_list[@]}"; do sort_key="${pid_comm[${sort_pid}]}"; sort_text[${sort_key:- }]+="${sort_pid} "; done
+		;;
+		"arguments")
+			for sort_pid in "${pid_list[@]}"; do sort_key="${pid_args[${sort_pid}]:-[${pid_comm[${sort_pid}]}]}"; sort_text[${sort_key}]+="${sort_pid} "; done
+		;;
+		"user")
+			for sort_pid in "${pid_list[@]}"; do sort_key="${pid_uid[${sort_pid}]}"; sort_key="${user_names[${sort_key}]:-${sort_key}}"; sort_text[${sort_key}]+="${sort_pid} "; done
+		;;
+	esac
 
-				time_elapsed=$((proc[new_timestamp]-proc[old_timestamp]))
-				
-				#* Calculate current cpu usage for process, * 1000 (for conversion from ms to seconds) * 1000 (for conversion to floating point)
-				cpu_percent[count]=$(( ( ( ${proc[new_${pid}_ticks]}-${proc[old_${pid}_ticks]} ) * 1000 * 1000 ) / ( cpu[hz]*time_elapsed*cpu[threads] ) ))
+	for sort_key in "${!sort_buckets[@]}"; do
+		sort_order+=(${sort_buckets[sort_key]})
+	done
 
-				if ((cpu_percent[count]<0)); then cpu_percent[count]=0
-				elif ((cpu_percent[count]>1000)); then cpu_percent[count]=1000; fi
-				
-				if ((${#cpu_percent[count]}<=3)); then
-					printf -v cpu_percent_string "%01d%s" "${cpu_percent[count]::-1}" ".${cpu_percent[count]:(-1)}"
+	#* Text values are kept in a cached sorted list, only new values are sorted and merged in
+	if ((${#sort_text[@]}>0)); then
+		if [[ ${proc[text_sorting]} != "${proc_sorting}" ]]; then
+			proc[text_sorting]="${proc_sorting}"
+			sort_text_keys=()
+			sort_text_known=()
+		fi
+
+		for sort_key in "${!sort_text[@]}"; do
+			if [[ -z ${sort_text_known[${sort_key}]} ]]; then sort_new+=("${sort_key}"); fi
+		done
+
+		if ((${#sort_new[@]}>0)); then
+			sort_array_str sort_new sort_new
+			sort_text_known=()
+			for ((i=0,j=0;i<${#sort_text_keys[@]} || j<${#sort_new[@]};)); do
+				if ((j>=${#sort_new[@]})) || { ((i<${#sort_text_keys[@]})) && [[ ! ${sort_new[j]} < ${sort_text_keys[i]} ]]; }; then
+					sort_key="${sort_text_keys[i++]}"
+					#* Drop values no longer used by any process
+					if [[ -z ${sort_text[${sort_key}]} ]]; then continue; fi
 				else
-					cpu_percent_string=${cpu_percent[count]::-1}
+					sort_key="${sort_new[j++]}"
 				fi
+				sort_merged+=("${sort_key}")
+				sort_text_known[${sort_key}]=1
+			done
+			sort_text_keys=("${sort_merged[@]}")
+		fi
 
-				printf -v cpu_percent_string "%5s" "${cpu_percent_string::4}"
+		for sort_key in "${sort_text_keys[@]}"; do
+			sort_order+=(${sort_text[${sort_key}]})
+		done
+	fi
 
-				proc_array[count]="${proc_array[count]::-5}${cpu_percent_string}"
+	#* Sort in descending order unless reversed
+	sort_out=()
+	if [[ -z ${proc[reverse]} ]]; then
+		for ((i=${#sort_order[@]}-1;i>=0;i--)); do
+			sort_out+=("${sort_order[i]}")
+		done
+	else
+		sort_out=("${sort_order[@]}")
+	fi
+}
 
+compile_filter() { #? Split filter string into terms and field scopes, prefix a term with "pid:", "program:", "cmd:" or "user:" to only match that field
+	local term
+	local -a terms
 
-				pid_graph="pid_${pid}_graph"
-				local -n pid_count="pid_${pid}_count"
+	filter_fields=()
+	filter_terms=()
+	filter_cache=()
+	proc[filter_compiled]="${filter}"
 
-				printf -v cpu_int "%01d" "${cpu_percent[count]::-1}"
+	#* A filter without any field prefix is matched as one whole string, spaces included
+	if [[ ! ${filter} =~ (^|[[:space:]])(pid|program|cmd|user): ]]; then
+		filter_fields=("any")
+		filter_terms=("${filter}")
+		return
+	fi
 
-				#* Get info for detailed box if enabled
-				if [[ ${pid} == "${proc[detailed_pid]}" ]]; then
-					if [[ -z ${proc[detailed_name]} ]]; then
-						local get_mem
-						local -a det_array
-						read -r proc[detailed_name] </proc/${pid}/comm ||true
-						proc[detailed_cmd]="$(tr '\000' ' ' </proc/${pid}/cmdline)"						
-						proc[detailed_name]="${proc[detailed_name]::15}"
-						det_array=($(ps -o ppid:4,euser:15 --no-headers -p $pid || true))	
-						proc[detailed_parent_pid]="${det_array[0]}"
-						proc[detailed_user]="${det_array[*]:1}"
-						proc[detailed_parent_name]="$(ps -o comm --no-headers -p ${det_array[0]} || true)"
-						get_mem=1
-					fi
-					proc[detailed_cpu]="${cpu_percent_string// /}"
-					proc[detailed_cpu_int]="${cpu_int}"
-					proc[detailed_threads]="${work_array[-4]}"
-					proc[detailed_runtime]="$(ps -o etime:4 --no-headers -p $pid || true)"
-
-					if [[ ${proc[detailed_mem]} != "${work_array[-2]}" || -n $get_mem ]] || ((++proc[detailed_mem_count]>5)); then
-						proc[detailed_mem_count]=0
-						proc[detailed_mem]="${work_array[-2]}"
-						proc[detailed_mem_int]="${proc[detailed_mem]/./}"
-						if [[ ${proc[detailed_mem_int]::1} == "0" ]]; then proc[detailed_mem_int]="${proc[detailed_mem_int]:1}0"; fi
-						#* Scale up low mem values to see any changes on mini graph
-						if ((proc[detailed_mem_int]>900)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/10))
-						elif ((proc[detailed_mem_int]>600)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/8))
-						elif ((proc[detailed_mem_int]>300)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/5))
-						elif ((proc[detailed_mem_int]>100)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/2))
-						elif ((proc[detailed_mem_int]<50)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]*2)); fi
-						unset 'proc[detailed_mem_string]'
-						floating_humanizer -v proc[detailed_mem_string] -B -s 1 "$(ps -o rss:1 --no-headers -p ${pid} || true)"
-						if [[ -z ${proc[detailed_mem_string]} ]]; then proc[detailed_mem_string]="? Byte"; fi
-					fi
-					
-					#* Copy process cpu usage to history array and trim earlier entries
-					if ((${#detail_history[@]}>box[details_width]*2)); then
-						detail_history=( "${detail_history[@]:${box[details_width]}}" "$((cpu_int+4))")
-					else
-						detail_history+=("$((cpu_int+4))")
-					fi
+	#* With field prefixes the filter is split on spaces and all terms must match
+	read -ra terms <<<"${filter}"
+	for term in "${terms[@]}"; do
+		case ${term} in
+			pid:*|program:*|cmd:*|user:*) filter_fields+=("${term%%:*}"); term="${term#*:}";;
+			*) filter_fields+=("any");;
+		esac
+		filter_terms+=("${term}")
+	done
+}
 
-					#* Copy process mem usage to history array and trim earlier entries
-					if ((${#detail_mem_history[@]}>box[details_width])); then
-						detail_mem_history=( "${detail_mem_history[@]:$((box[details_width]/2))}" "${proc[detailed_mem_int]}")
-					else
-						detail_mem_history+=("${proc[detailed_mem_int]}")
-					fi
+filter_process() { #? Match a pid from the process table against compiled filter and cache result, all terms must match
+	local pid="$1" i user uid="${pid_uid[$1]}" match=1
+	user="${user_names[${uid}]:-${uid}}"
+
+	for ((i=0;i<${#filter_terms[@]};i++)); do
+		case ${filter_fields[i]} in
+			pid) if [[ ${pid} != "${filter_terms[i]}" ]]; then match=0; fi;;
+			program) if [[ ! ${pid_comm[${pid}]} =~ ${filter_terms[i]} ]]; then match=0; fi;;
+			cmd) if [[ ! ${pid_args[${pid}]:-[${pid_comm[${pid}]}]} =~ ${filter_terms[i]} ]]; then match=0; fi;;
+			user) if [[ ! ${user} =~ ${filter_terms[i]} ]]; then match=0; fi;;
+			any) if [[ ! ${pid} =~ ${filter_terms[i]} && ! ${pid_comm[${pid}]} =~ ${filter_terms[i]} && ! ${pid_args[${pid}]} =~ ${filter_terms[i]} && ! ${user} =~ ${filter_terms[i]} ]]; then match=0; fi;;
+		esac
+		if ((match==0)); then break; fi
+	done
 
-					#* Remove selected process from array if process is excluded by filtering or not on first page
-					if [[ -n $filter && ! ${proc[detailed_name]} =~ $filter ]]; then
-						unset 'proc_array[count]'
-						cpu_int=0; pid_count=0
-					fi
-				fi
+	filter_cache[${pid}]=${match}
+}
+
+collect_processes() { #? Collect process information and calculate accurate cpu usage
+	local argument="$1"
+	if [[ -n $skip_process_draw && $argument != "now" ]]; then return; fi
+	local height=${box[processes_height]} pid tmp_value_array cpu_int pmem elapsed slot
+	local -a filtered
 
-				#* Create small graphs for all visible processes using more than 1% cpu time
-				if [[ ${cpu_int} -gt 0 ]]; then pid_count=5; fi
+	if [[ $argument == "now" ]]; then skip_process_draw=1; fi
 
-				if [[ -z ${!pid_graph} && ${cpu_int} -gt 0 ]]; then
-						tmp_value_array=("$((cpu_int+4))")
-					create_mini_graph -o "pid_${pid}_graph" -nc -w 5 "tmp_value_array"
-				elif [[ ${pid_count} -gt 0 ]]; then
-					if [[ ${cpu_int} -gt 9 ]]; then
-						create_mini_graph -nc -add-value "pid_${pid}_graph" "$((cpu_int+20))"
-					else
-						create_mini_graph -nc -add-value "pid_${pid}_graph" "$((cpu_int+4))"
-					fi
-					
-					pid_count=$((${pid_count}-1))
-				elif [[ ${pid_count} == "0" ]]; then
-					unset "pid_${pid}_graph"
-					unset "pid_${pid}_count"
-				fi
-			else
-				tmp_percent="${proc_array[count]:(-5)}"; tmp_percent="${tmp_percent// /}"; if [[ ${tmp_percent//./} != "$tmp_percent" ]]; then tmp_percent="${tmp_percent::-2}"; fi
-				if ((tmp_percent>100)); then
-					proc_array[count]="${proc_array[count]::-5}  100"
-				fi
-			fi
+	if ((proc[detailed]==0)) && [[ -n ${proc[detailed_name]} ]]; then
+		unset 'proc[detailed_name]' 'proc[detailed_killed]' 'proc[detailed_cpu_int]' 'proc[detailed_cmd]'
+		unset 'proc[detailed_mem]' 'proc[detailed_mem_int]' 'proc[detailed_user]' 'proc[detailed_threads]'
+		unset 'detail_graph[@]' 'detail_mem_graph' 'detail_history[@]' 'detail_mem_history[@]'
+		unset 'proc[detailed_runtime]' 'proc[detailed_mem_string]' 'proc[detailed_parent_pid]' 'proc[detailed_parent_name]' 'proc[detailed_start]'
+	fi
 
-			proc[old_${pid}_ticks]=${proc[new_${pid}_ticks]}
-			
-		fi
+	unset 'proc[detailed_cpu]'
+
+	#* Read all processes from "/proc" and create process list in sorted order
+	scan_processes
+	sort_processes proc_order
+
+	#* Filter sorted pids, compile filter only when it has changed
+	if [[ -n $filter ]]; then
+		if [[ ${proc[filter_compiled]} != "${filter}" ]]; then compile_filter; fi
+		for pid in "${proc_order[@]}"; do
+			if [[ -z ${filter_cache[${pid}]} ]]; then filter_process "${pid}"; fi
+			if [[ ${filter_cache[${pid}]} == "1" ]]; then filtered+=("${pid}"); fi
+		done
+		proc_order=("${filtered[@]}")
+	fi
+
+	proc[pages]=$(( (${#proc_order[@]}-1)/(height-3)+1 ))
+	if ((proc[page]>proc[pages])); then proc[page]=${proc[pages]}; fi
+
+	select_processes
+
+	#* Create small graphs for all visible processes using more than 1% cpu time
+	((++proc[graph_tick]))
+	for pid in "${proc_page[@]}"; do
+		cpu_int=$((cpu_percent[${pid}]/10))
+		slot="${graph_slot[${pid}]}"
+
+		if ((cpu_int>0)); then
+			if [[ -z ${slot} ]]; then
+				pid_graph_slot "${pid}" slot
+				tmp_value_array=("$((cpu_int+4))")
+				create_mini_graph -o "graph_pool[${slot}]" -nc -w 5 "tmp_value_array"
+				graph_pool_count[slot]=5
+				continue
+			fi
+			graph_pool_count[slot]=5
+		elif [[ -z ${slot} ]]; then continue; fi
 
-		if ((breaking==1)); then 
-			if [[ ${proc[detailed]} == "1" && -z ${proc[detailed_cpu]} ]] && ps ${proc[detailed_pid]} >/dev/null 2>&1; then
-				readarray ${options} -O ${#proc_array[@]} proc_array < <(ps -o pid:${proc[pid_len]}=Pid:,comm:${format_cmd}=Program:${format_args},nlwp:3=Tr:,euser:6=User:,pmem=Mem%,pcpu:10=Cpu% --no-headers -p ${proc[detailed_pid]} || true)
+		graph_pool_used[slot]=${proc[graph_tick]}
+		if ((graph_pool_count[slot]>0)); then
+			if ((cpu_int>9)); then
+				create_mini_graph -nc -add-value "graph_pool[${slot}]" "$((cpu_int+20))"
 			else
-				break
+				create_mini_graph -nc -add-value "graph_pool[${slot}]" "$((cpu_int+4))"
 			fi
+			((--graph_pool_count[slot])) || true
+		else
+			pid_graph_free "${pid}"
 		fi
-
 	done
 
+	#* Get info for detailed box if enabled, values are taken from the process table, static values are kept until process start time changes
+	pid="${proc[detailed_pid]}"
+	if ((proc[detailed]==1)) && [[ -n ${pid_ticks[${pid}]} ]]; then
+		if [[ -z ${proc[detailed_name]} || ${proc[detailed_start]} != "${pid_start[${pid}]}" ]]; then
+			local get_mem=1
+			proc[detailed_start]="${pid_start[${pid}]}"
+			proc[detailed_name]="${pid_comm[${pid}]::15}"
+			proc[detailed_cmd]="${pid_args[${pid}]}"
+			proc[detailed_user]="${user_names[${pid_uid[${pid}]}]:-${pid_uid[${pid}]}}"
+			unset 'proc[detailed_parent_pid]'
+		fi
+		if [[ ${proc[detailed_parent_pid]} != "${pid_ppid[${pid}]}" ]]; then
+			proc[detailed_parent_pid]="${pid_ppid[${pid}]}"
+			proc[detailed_parent_name]="${pid_comm[${pid_ppid[${pid}]}]}"
+		fi
+		cpu_int=$((cpu_percent[${pid}]/10))
+		if ((cpu_percent[${pid}]<1000)); then printf -v proc[detailed_cpu] "%01d%s" "${cpu_percent[${pid}]::-1}" ".${cpu_percent[${pid}]:(-1)}"
+		else proc[detailed_cpu]=100; fi
+		proc[detailed_cpu_int]="${cpu_int}"
+		proc[detailed_threads]="${pid_threads[${pid}]}"
+
+		#* Elapsed time since process start formatted as [[dd-]hh:]mm:ss
+		elapsed=$(( (proc[uptime_ticks]-${pid_start[${pid}]})/cpu[hz] ))
+		if ((elapsed<0)); then elapsed=0; fi
+		if ((elapsed>=86400)); then printf -v proc[detailed_runtime] "%d-%02d:%02d:%02d" "$((elapsed/86400))" "$((elapsed%86400/3600))" "$((elapsed%3600/60))" "$((elapsed%60))"
+		elif ((elapsed>=3600)); then printf -v proc[detailed_runtime] "%02d:%02d:%02d" "$((elapsed/3600))" "$((elapsed%3600/60))" "$((elapsed%60))"
+		else printf -v proc[detailed_runtime] "%02d:%02d" "$((elapsed/60))" "$((elapsed%60))"; fi
+
+		pmem=$(( ${pid_rss[${pid}]}*proc[page_kb]*1000/mem[total] ))
+		printf -v pmem "%01d%s" "${pmem::-1}" ".${pmem:(-1)}"
+		if [[ ${proc[detailed_mem]} != "${pmem}" || -n $get_mem ]] || ((++proc[detailed_mem_count]>5)); then
+			proc[detailed_mem_count]=0
+			proc[detailed_mem]="${pmem}"
+			proc[detailed_mem_int]="${proc[detailed_mem]/./}"
+			if [[ ${proc[detailed_mem_int]::1} == "0" ]]; then proc[detailed_mem_int]="${proc[detailed_mem_int]:1}0"; fi
+			#* Scale up low mem values to see any changes on mini graph
+			if ((proc[detailed_mem_int]>900)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/10))
+			elif ((proc[detailed_mem_int]>600)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/8))
+			elif ((proc[detailed_mem_int]>300)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/5))
+			elif ((proc[detailed_mem_int]>100)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]/2))
+			elif ((proc[detailed_mem_int]<50)); then proc[detailed_mem_int]=$((proc[detailed_mem_int]*2)); fi
+			unset 'proc[detailed_mem_string]'
+			floating_humanizer -v proc[detailed_mem_string] -B -s 1 "$(( ${pid_rss[${pid}]}*proc[page_kb] ))"
+			if [[ -z ${proc[detailed_mem_string]} ]]; then proc[detailed_mem_string]="? Byte"; fi
+		fi
 
-	proc[old_timestamp]=${proc[new_timestamp]}
+		#* Copy process cpu usage to history array and trim earlier entries
+		if ((${#detail_history[@]}>box[details_width]*2)); then
+			detail_history=( "${detail_history[@]:${box[details_width]}}" "$((cpu_int+4))")
+		else
+			detail_history+=("$((cpu_int+4))")
+		fi
+
+		#* Copy process mem usage to history array and trim earlier entries
+		if ((${#detail_mem_history[@]}>box[details_width])); then
+			detail_mem_history=( "${detail_mem_history[@]:$((box[details_width]/2))}" "${proc[detailed_mem_int]}")
+		else
+			detail_mem_history+=("${proc[detailed_mem_int]}")
+		fi
+	fi
 
 	if ((proc[detailed]==1)) && [[ -z ${proc[detailed_cpu]} && -z ${proc[detailed_killed]} ]]; then proc[detailed_killed]=1; proc[detailed_change]=1
 	elif [[ -n ${proc[detailed_cpu]} ]]; then unset 'proc[detailed_killed]'; fi
+}
+
+select_processes() { #? Pick out the pids for the visible page from the ordered process list and create rows for them
+	local width=${box[processes_width]} rows=$((box[processes_height]-3)) symbol="▼" selected format_args format_cmd proc_format
+	local pid uid pmem pmem_string cpu_string start value skip step n=0 count=0 i pass unread
+	local -a cpu_bucket cpu_bucket_count cpu_values bucket
+
+	if [[ -n ${proc[reverse]} ]]; then symbol="▲"; fi
+	case ${proc_sorting} in
+		"pid") selected="Pid:";;
+		"program") selected="Program:";;
+		"arguments") selected="Arguments:";;
+		"threads") selected="Threads:";;
+		"user") selected="User:";;
+		"memory") selected="Mem%";;
+		"cpu lazy"|"cpu responsive") selected="Cpu%";;
+	esac
+
+	#* Set column widths, arguments column is only shown if box is wide enough
+	if ((width>60)); then format_args=$(( width-(47+proc[pid_len]) )); format_cmd=15
+		proc_format="%${proc[pid_len]}s %-${format_cmd}.${format_cmd}s %-${format_args}.${format_args}s %3s %-6.6s %4s %10s"
+	else format_cmd=$(( width-(31+proc[pid_len]) ))
+		proc_format="%${proc[pid_len]}s %-${format_cmd}.${format_cmd}s%.0s %3s %-6.6s %4s %10s"
+	fi
+	unset 'proc_array[@]' 'proc_page[@]'
+
+	printf -v 'proc_array[0]' "${proc_format}" "Pid:" "Program:" "Arguments:" "Tr:" "User:" "Mem%" "Cpu%"
+	proc_array[0]="${proc_array[0]/      Tr:/ Threads:}"
+	proc_array[0]="${proc_array[0]/ ${selected}/${symbol}${selected}}"
+
+	start=$(( rows*(proc[page]-1) ))
+	if [[ $proc_windowed == true ]]; then get_ms proc[read_timestamp]; fi
 
-	#* Sort output array based on cpu usage if "cpu responsive" is selected
 	if [[ ${proc_sorting} == "cpu responsive" ]]; then
-		local -a sort_array
-		if [[ -z ${proc[reverse]} ]]; then local sort_rev="-r"; fi
-		sort_array[0]="${proc_array[0]}"
-		readarray -O 1 -t sort_array < <(printf "%s\n" "${proc_array[@]:1}" | awk '{ print $NF, $0 }' | sort -n -k1 ${sort_rev}| sed 's/^[0-9\.]* //')
-		proc_array=("${sort_array[@]}")
-	fi
-
-	#* Clear up memory by removing variables and graphs of no longer running processes
-	((++proc[general_counter]))
-	if ((proc[general_counter]>100)); then
-		proc[general_counter]=0
-		for ((i=0;i<${#pid_history[@]};i++)); do
-			if [[ -n ${pid_history[$i]} && ! -e /proc/${pid_history[$i]} ]]; then
-				unset "pid_${pid_history[$i]}_graph"
-				unset "pid_${pid_history[$i]}_count"
-				unset "proc[new_${pid_history[$i]}_ticks]"
-				unset "proc[old_${pid_history[$i]}_ticks]"
-				unset "pid_history[${i}]"
-			fi
+		#* Put pids in buckets by cpu usage, bucket order within is kept from the lazy sorting, then walk buckets from the top until visible page is filled
+		#* In windowed mode the page is read and picked again until all pids on it has current values, pids not shown still sort by older values
+		for ((pass=0;pass<3;pass++)); do
+			cpu_bucket=(); cpu_bucket_count=(); proc_page=(); n=0
+			for pid in "${proc_order[@]}"; do
+				value=${cpu_percent[${pid}]:-0}
+				cpu_bucket[value]+=" ${pid}"
+				((++cpu_bucket_count[value]))
+			done
+			cpu_values=("${!cpu_bucket[@]}")
+			if [[ -z ${proc[reverse]} ]]; then i=$((${#cpu_values[@]}-1)); step=-1; else i=0; step=1; fi
+			for ((;i>=0 && i<${#cpu_values[@]} && ${#proc_page[@]}<rows;i+=step)); do
+				value=${cpu_values[i]}
+				if ((n+cpu_bucket_count[value]<=start)); then n=$((n+cpu_bucket_count[value])); continue; fi
+				skip=$((start-n)); if ((skip<0)); then skip=0; fi
+				bucket=(${cpu_bucket[value]})
+				proc_page+=("${bucket[@]:skip:rows-${#proc_page[@]}}")
+				n=$((n+cpu_bucket_count[value]))
+			done
+
+			if [[ $proc_windowed != true ]]; then break; fi
+			unread=0
+			for pid in "${proc_page[@]}"; do
+				if ((${pid_old_time[${pid}]:-0}<proc[new_timestamp])); then read_process "${pid}" || true; unread=1; fi
+			done
+			if ((unread==0)); then break; fi
+		done
+	else
+		proc_page=("${proc_order[@]:start:rows}")
+	fi
+
+	#* In windowed mode the visible page and detailed process are read here if not already read since last update
+	if [[ $proc_windowed == true ]]; then
+		for pid in "${proc_page[@]}" ${proc[detailed_pid]}; do
+			if ((${pid_old_time[${pid}]:-0}<proc[new_timestamp])); then read_process "${pid}" || true; fi
 		done
-		pid_history=(${pid_history[@]})
 	fi
 
+	for pid in "${proc_page[@]}"; do
+		#* Memory usage and cpu usage in tenths of percent
+		pmem=$(( ${pid_rss[${pid}]}*proc[page_kb]*1000/mem[total] ))
+		printf -v pmem_string "%01d%s" "${pmem::-1}" ".${pmem:(-1)}"
+
+		value=${cpu_percent[${pid}]:-0}
+		if ((value<1000)); then printf -v cpu_string "%01d%s" "${value::-1}" ".${value:(-1)}"
+		else cpu_string=100; fi
+
+		uid="${pid_uid[${pid}]}"
+		printf -v 'proc_array[++count]' "${proc_format}" "${pid}" "${pid_comm[${pid}]}" "${pid_args[${pid}]:-[${pid_comm[${pid}]}]}" "${pid_threads[${pid}]}" "${user_names[${uid}]:-${uid}}" "${pmem_string}" "${cpu_string}"
+	done
+
+	proc[page_shown]=${proc[page]}
 }
 
 collect_net() { #? Collect information from "/proc/net/dev"
@@ -1926,6 +2783,23 @@ calc_sizes() { #? Calculate width and height of all boxes
 	if [[ $check_temp == true ]]; then
 		box[p_width]=$(( box[p_width]+13*box_cols))
 	fi
+	if [[ -n ${cpu[freq_source]} ]]; then
+		box[p_width]=$(( box[p_width]+5*box_cols))
+	fi
+	if [[ $cpu_stacked == true ]]; then ((++box[p_height])); fi
+
+	#* If all threads doesn't fit, show cpu total in one column followed by usage per socket and a grid with one block per thread
+	unset 'box[cpu_compact]'
+	if ((box[p_height]>cpu_height)); then
+		box[cpu_compact]=1
+		box[p_width]=$((24*box_cols))
+		if [[ $check_temp == true ]]; then box[p_width]=$((box[p_width]+13)); fi
+		if [[ -n ${cpu[freq_source]} ]]; then box[p_width]=$((box[p_width]+5)); fi
+		box[grid_width]=$((box[p_width]-4))
+		box[p_height]=$(( (threads+box[grid_width]-1)/box[grid_width]+4 ))
+		if ((cpu[sockets]>1)); then box[p_height]=$((box[p_height]+cpu[sockets])); fi
+		if [[ $cpu_stacked == true ]]; then ((++box[p_height])); fi
+	fi
 	
 	if ((box[p_height]>cpu_height)); then box[p_height]=$cpu_height; fi	
 	box[p_col]="$((cpu_width-box[p_width]+2))"
@@ -1937,6 +2811,14 @@ calc_sizes() { #? Calculate width and height of all boxes
 	box[m_width2]=${box[m_width]}
 	if ((box[m_width]+box[m_width2]<mem_width)); then ((box[m_width]++)); fi
 	box[m_height]=$mem_height
+
+	#* Rows at the bottom of the memory column for pressure stall graphs, "full" graphs are left out if there isn't room for them
+	box[psi_rows]=0
+	if [[ -n ${psi[available]} ]]; then
+		if ((mem_height>=16)); then box[psi_rows]=7
+		elif ((mem_height>=12)); then box[psi_rows]=4; fi
+	fi
+	box[m_height]=$((mem_height-box[psi_rows]))
 	box[m_col]=$((mem_col+1))
 	box[m_line]=$mem_line
 
@@ -1984,13 +2866,34 @@ draw_bg() { #? Draw all box outlines
 	draw_update_string $1
 }
 
+create_stacked_meter() { #? Create cpu total meter stacked from user, system, iowait and steal time, uses meter and meter_width from draw_cpu
+	local class cells filled=0 sum=0
+	local -A class_color=([user]="${theme[cpu_start]}" [system]="${theme[cpu_mid]}" [iowait]="${theme[temp_start]}" [steal]="${theme[cpu_end]}")
+
+	meter=""
+	print -v meter -rs
+	for class in user system iowait steal; do
+		sum=$((sum+${cpu[${class}]:-0}))
+		if ((sum>100)); then sum=100; fi
+		cells=$((sum*meter_width/100-filled))
+		if ((cells>0)); then
+			print -v meter -fg ${class_color[${class}]} -rp ${cells} -t "■"
+			filled=$((filled+cells))
+		fi
+	done
+	if ((filled<meter_width)); then print -v meter -fg ${theme[inactive_fg]} -rp $((meter_width-filled)) -t "■"; fi
+}
+
 draw_cpu() { #? Draw cpu and core graphs and print percentages
 	local cpu_out i name cpu_p_color temp_color y pt_line pt_col p_normal_color="${theme[main_fg]}" threads=${cpu[threads]}
-	local meter meter_size meter_width temp_var cpu_out_var core_name temp_name temp_width
+	local meter meter_size meter_width temp_var cpu_out_var core_name temp_name extra_width freq_width=0 freq_string irq_out
 
 	#* Get variables from previous calculations
 	local col=$((box[cpu_col]+1)) line=$((box[cpu_line]+1)) width=$((box[cpu_width]-2)) height=$((box[cpu_height]-2))
 	local p_width=${box[p_width]} p_height=${box[p_height]} p_col=${box[p_col]} p_line=${box[p_line]}
+
+	#* In compact mode only cpu total is drawn as a row, no graphs are kept for each thread
+	if [[ -n ${box[cpu_compact]} ]]; then threads=0; fi
 	
 	#* If resized recreate cpu meter/graph box, cpu graph and core graphs
 	if ((resized>0)); then
@@ -2013,22 +2916,28 @@ draw_cpu() { #? Draw cpu and core graphs and print percentages
 		((resized++))
 	fi
 
-	#* Add new values to cpu and core graphs unless just resized
-	if ((resized==0)); then
+	#* Add new values to cpu and core graphs unless just resized, graphs are only moved for values collected this update
+	if ((resized==0)) && [[ -n ${collector_changed[cpu]} ]]; then
 		create_graph -add-last cpu_graph_a cpu_history
 		create_graph -i -add-last cpu_graph_b cpu_history
 		for((i=1;i<=threads;i++)); do
 			declare -n core_hist="cpu_core_history_${i}[-1]"
 			create_mini_graph -w 10 -c color_cpu_graph -add-value "cpu_core_graph_$i" ${core_hist}
 		done
-		if [[ $check_temp == true ]]; then
-			for((i=0;i<=threads;i++)); do
-				declare -n temp_hist="cpu_temp_history_${i}[-1]"
-				create_mini_graph -w 5 -c color_temp_graph -add-value "cpu_temp_graph_$i" ${temp_hist}
-			done
-		fi
+	fi
+	if ((resized==0)) && [[ -n ${collector_changed[temps]} && $check_temp == true ]]; then
+		for((i=0;i<=threads;i++)); do
+			declare -n temp_hist="cpu_temp_history_${i}[-1]"
+			create_mini_graph -w 5 -c color_temp_graph -add-value "cpu_temp_graph_$i" ${temp_hist}
+		done
 	fi
 
+	#* Current frequency is shown after usage percentage if available
+	if [[ -n ${cpu[freq_source]} ]]; then freq_width=5; fi
+
+	#* Show busiest cpus by interrupts instead of the cpu graph if enabled, graphs are still updated
+	if [[ $cpu_irq_view == true ]]; then draw_irqs; fi
+
 	#* Print CPU total and all cpu core percentage meters in box
 	for((i=0;i<=threads;i++)); do
 		if ((i==0)); then name="CPU"; else name="Core${i}"; fi
@@ -2038,42 +2947,79 @@ draw_cpu() { #? Draw cpu and core graphs and print percentages
 		
 		pt_col=$p_col; pt_line=$p_line; meter_size="small"; meter_width=10
 		
-		#* Set temperature string if "sensors" is available
+		#* Set temperature string if enabled
+		extra_width=${freq_width}
 		if [[ $check_temp == true ]]; then
 			#* Get color of temperature text depending on current temp vs factory high temp
 			declare -n temp_hist="cpu_temp_history_${i}[-1]"
 			temp_color="${color_temp_graph[${temp_hist}]}"
 			temp_name="cpu_temp_graph_$i"
-			temp_width=13
+			extra_width=$((13+freq_width))
 		fi
 
-		if ((i==0 & p_width>24+temp_width)); then 
-			name="CPU Total "; meter_width=$((p_width-17-temp_width))
+		if ((i==0 & p_width>24+extra_width)); then 
+			name="CPU Total "; meter_width=$((p_width-17-extra_width))
 		fi
 		
 
 		#* Create cpu usage meter
-		if ((i==0)); then
+		if ((i==0)) && [[ $cpu_stacked == true ]]; then
+			create_stacked_meter
+		elif ((i==0)); then
 			create_meter -v meter -w $meter_width -f -c color_cpu_graph ${cpu_usage[i]}
 		else
 			core_name="cpu_core_graph_$i"
 			meter="${!core_name}"
 		fi
 		
-		if ((p_width>84+temp_width & i>=(p_height-2)*3-2)); then pt_line=$((p_line+i-y*4)); pt_col=$((p_col+72+temp_width*3))
-		elif ((p_width>54+temp_width & i>=(p_height-2)*2-1)); then pt_line=$((p_line+i-y*3)); pt_col=$((p_col+48+temp_width*2))
-		elif ((p_width>24+temp_width & i>=p_height-2)); then pt_line=$((p_line+i-y*2)); pt_col=$((p_col+24+temp_width))
+		if ((p_width>84+extra_width & i>=(p_height-2)*3-2)); then pt_line=$((p_line+i-y*4)); pt_col=$((p_col+72+extra_width*3))
+		elif ((p_width>54+extra_width & i>=(p_height-2)*2-1)); then pt_line=$((p_line+i-y*3)); pt_col=$((p_col+48+extra_width*2))
+		elif ((p_width>24+extra_width & i>=p_height-2)); then pt_line=$((p_line+i-y*2)); pt_col=$((p_col+24+extra_width))
 		else y=$i; fi
 
 		print -v cpu_out_var -m $((pt_line+y)) $pt_col -rs -fg $p_normal_color -jl 7 -t "$name" -fg ${theme[inactive_fg]} "⡀⡀⡀⡀⡀⡀⡀⡀⡀⡀" -l 10 -t "$meter"\
 		-fg $cpu_p_color -jr 4 -t "${cpu_usage[i]}" -fg $p_normal_color -t "%"
+		if ((freq_width>0)); then
+			if ((cpu_freq[i]>=1000)); then freq_string="$((cpu_freq[i]/1000)).$((cpu_freq[i]%1000/100))G"
+			elif [[ -n ${cpu_freq[i]} ]]; then freq_string="${cpu_freq[i]}M"
+			else freq_string=""; fi
+			print -v cpu_out_var -fg ${theme[inactive_fg]} -jr ${freq_width} -t "${freq_string}"
+		fi
 		if [[ $check_temp == true ]]; then
 			print -v cpu_out_var -fg ${theme[inactive_fg]} "  ⡀⡀⡀⡀⡀" -l 7 -t "  ${!temp_name}" -fg $temp_color -jr 4 -t ${cpu[temp_${i}]} -fg $p_normal_color -t ${cpu[temp_unit]}
 		fi
 
-		if (( i>(p_height-2)*( p_width/(24+temp_width) )-( p_width/(24+temp_width) )-1 )); then break; fi	
+		if (( i>(p_height-2)*( p_width/(24+extra_width) )-( p_width/(24+extra_width) )-1 )); then break; fi	
 	done
 
+	#* Compact mode, usage per socket if more than one and a grid with one block per thread colored by usage
+	if [[ -n ${box[cpu_compact]} ]]; then
+		local socket grid_out
+		local -a socket_sum socket_count
+		if ((cpu[sockets]>1)); then
+			for((i=1;i<=cpu[threads];i++)); do
+				socket=${cpu_socket[i]:-0}
+				socket_sum[socket]=$(( ${socket_sum[socket]:-0}+${cpu_usage[i]:-0} ))
+				((++socket_count[socket]))
+			done
+			for socket in "${!socket_sum[@]}"; do
+				socket_sum[socket]=$((socket_sum[socket]/socket_count[socket]))
+				create_meter -v meter -w 10 -f -c color_cpu_graph ${socket_sum[socket]}
+				print -v cpu_out_var -m $((pt_line+(++y))) $pt_col -rs -fg $p_normal_color -jl 7 -t "Sock${socket}" -t "$meter"\
+				-fg ${color_cpu_graph[socket_sum[socket]]} -jr 4 -t "${socket_sum[socket]}" -fg $p_normal_color -t "%"
+			done
+		fi
+		for((i=1;i<=cpu[threads];i++)); do
+			if (( (i-1)%box[grid_width]==0 )); then
+				if ((pt_line+y+3>=p_line+p_height)); then break; fi
+				grid_out+="\e[$((pt_line+(++y)));${pt_col}f"
+			fi
+			cpu_p_color="${color_cpu_graph[cpu_usage[i]]}"
+			grid_out+="\e[38;2;${cpu_p_color// /;}m■"
+		done
+		cpu_out_var+="${grid_out}"
+	fi
+
 	#* Print load average and uptime
 	if ((pt_line+y+3<p_line+p_height)); then
 		local avg_string avg_width
@@ -2083,19 +3029,172 @@ draw_cpu() { #? Draw cpu and core graphs and print percentages
 			print -v cpu_out_var -jc $avg_width -t "${avg_string::4}"
 		done
 	fi
+
+	#* Print percentages for the time classes in stacked meter in the same colors
+	if [[ $cpu_stacked == true ]] && ((pt_line+y+4<p_line+p_height)); then
+		print -v cpu_out_var -m $((pt_line+y+2)) $pt_col -fg ${theme[cpu_start]} -t "usr ${cpu[user]:-0}% " -fg ${theme[cpu_mid]} -t "sys ${cpu[system]:-0}% "\
+		-fg ${theme[temp_start]} -t "io ${cpu[iowait]:-0}% " -fg ${theme[cpu_end]} -t "st ${cpu[steal]:-0}%"
+	fi
 	print -v cpu_out_var -m $((line+height-1)) $((col+1)) -fg ${theme[inactive_fg]} -trans -t "up ${cpu[uptime]}"
+	if ((width>60)) && [[ -n ${cpu[tasks_total]} ]]; then print -v cpu_out_var -trans -t "  tasks ${cpu[tasks_running]}/${cpu[tasks_total]}"; fi
+
+	#* Print rates for context switches, interrupts and forks right of the clock, mini graphs are scaled to the highest value shown
+	local rate_name rate_label rate_value rate_max rate_start rate_graph rate_string rate_count=$(( (width/2-12)/19 ))
+	local -a rate_scaled
+	if ((rate_count>3)); then rate_count=3; fi
+	local rate_col=$((col+width-1-rate_count*19))
+	for rate_name in ctxt intr processes; do
+		if ((rate_count--<=0)); then break; fi
+		case $rate_name in
+			ctxt) rate_label="ctx";;
+			intr) rate_label="int";;
+			processes) rate_label="fork";;
+		esac
+		local -n rate_history="cpu_rate_history_${rate_name}"
+		rate_max=1; rate_scaled=(); rate_start=$((${#rate_history[@]}-6))
+		if ((rate_start<0)); then rate_start=0; fi
+		for rate_value in "${rate_history[@]:rate_start}"; do if ((rate_value>rate_max)); then rate_max=${rate_value}; fi; done
+		for rate_value in "${rate_history[@]:rate_start}"; do rate_scaled+=($((rate_value*100/rate_max))); done
+		rate_graph=""
+		if ((${#rate_scaled[@]}>0)); then create_mini_graph -o rate_graph -w 6 -c color_cpu_graph rate_scaled; fi
+
+		format_rate "${cpu[${rate_name}_rate]:-0}" rate_string
+
+		print -v cpu_out_var -m ${box[cpu_line]} ${rate_col} -rs -fg ${box[cpu_color]} -t "┤" -fg ${theme[title]} -jl 5 -t "${rate_label}"\
+		-fg ${theme[inactive_fg]} "⡀⡀⡀⡀⡀⡀" -l 6 -t "${rate_graph}" -fg ${theme[title]} -b -jr 6 -t "${rate_string}" -rs -fg ${box[cpu_color]} -t "├"
+		rate_col=$((rate_col+19))
+	done
 
 	#* Print current CPU frequency right of the title in the meter box
 	if [[ -n ${cpu[freq_string]} ]]; then print -v cpu_out_var -m $((p_line-1)) $((p_col+p_width-5-${#cpu[freq_string]})) -fg ${theme[div_line]} -t "┤" -fg ${theme[title]} -b -t "${cpu[freq_string]}" -rs -fg ${theme[div_line]} -t "├"; fi
 	
 	#* Print created text, graph and meters to output variable
-	draw_out+="${cpu_graph_a[*]}${cpu_graph_b[*]}${cpu_out_var}"
+	if [[ $cpu_irq_view == true ]]; then draw_out+="${irq_out}${cpu_out_var}"
+	else draw_out+="${cpu_graph_a[*]}${cpu_graph_b[*]}${cpu_out_var}"; fi
+
+}
+
+draw_irqs() { #? Print cpus with the most interrupts and softirqs per second and their top sources, in the area used for the cpu graph
+	local col=$((box[cpu_col]+1)) line=$((box[cpu_line]+1)) width=$((box[cpu_width]-box[p_width]-4)) height=$((box[cpu_height]-2))
+	local i id top_id top_rate row pair pair_rate pair_name top_pair classes class_string rate_string
+	local -A shown
+
+	print -v irq_out -m ${line} ${col} -rs -fg ${theme[title]} -b -jl 7 -t "Cpu" -jr 6 -t "irq/s" -rs -fg ${theme[title]} -t "  Top interrupts and softirqs"
+	for((row=1;row<height;row++)); do
 
+		#* Find busiest cpu not shown yet
+		unset top_id; top_rate=0
+		for id in "${!irq_total[@]}"; do
+			if [[ -z ${shown[${id}]} ]] && ((irq_total[id]>top_rate)); then top_id=${id}; top_rate=${irq_total[id]}; fi
+		done
+
+		if [[ -z ${top_id} ]]; then
+			print -v irq_out -m $((line+row)) ${col} -rp ${width} -t " "
+			if ((row==1)); then print -v irq_out -m $((line+row)) ${col} -fg ${theme[inactive_fg]} -t "Collecting..."; fi
+			continue
+		fi
+		shown[${top_id}]=1
+
+		#* Three largest sources for this cpu
+		classes="${irq_classes[top_id]}"
+		class_string=""
+		for((i=0;i<3;i++)); do
+			top_pair=""; top_rate=0
+			for pair in ${classes}; do
+				pair_rate=${pair%%:*}
+				if ((pair_rate>top_rate)); then top_rate=${pair_rate}; top_pair="${pair}"; fi
+			done
+			if [[ -z ${top_pair} ]]; then break; fi
+			classes=" ${classes} "; classes="${classes/ ${top_pair} / }"
+			pair_name=${top_pair#*:}
+			format_rate "${top_rate}" rate_string
+			class_string+="  ${pair_name} ${rate_string}"
+		done
+
+		format_rate "${irq_total[top_id]}" rate_string
+		print -v irq_out -m $((line+row)) ${col} -rs -fg ${theme[main_fg]} -jl 7 -t "Cpu${top_id}" -fg ${theme[title]} -jr 6 -t "${rate_string}"\
+		-fg ${theme[inactive_fg]} -jl $((width-13)) -t "${class_string::$((width-13))}"
+	done
+}
+
+draw_diskio() { #? Draw read and write speed, wait and a graph of total speed in the rows left for it below each disk name
+	local i dev rate_string text graph_width io_value io_max io_start io_graph col=${box[io_col]} width=${box[io_width]}
+	local -a io_scaled
+	unset io_out
+
+	for i in "${!disks_io_line[@]}"; do
+		dev="${disks_io_dev[i]}"
+		format_rate "${diskio[${dev}_read_bps]:-0}" rate_string; text="R ${rate_string}"
+		format_rate "${diskio[${dev}_write_bps]:-0}" rate_string; text+=" W ${rate_string}"
+		if ((width>=30)); then text+=" ${diskio[${dev}_await]:-0}ms"; fi
+		if ((width>=40)); then format_rate "${diskio[${dev}_iops]:-0}" rate_string; text+=" ${rate_string}iops"; fi
+		graph_width=$((width-${#text}-5))
+
+		#* Graph is scaled to the highest value shown
+		io_graph=""
+		if ((graph_width>=3)); then
+			local -n io_history="diskio_history_${dev/:/_}"
+			io_max=1; io_scaled=(); io_start=$((${#io_history[@]}-graph_width))
+			if ((io_start<0)); then io_start=0; fi
+			for io_value in "${io_history[@]:io_start}"; do if ((io_value>io_max)); then io_max=${io_value}; fi; done
+			for io_value in "${io_history[@]:io_start}"; do io_scaled+=($((io_value*100/io_max))); done
+			if ((${#io_scaled[@]}>0)); then create_mini_graph -o io_graph -w ${graph_width} -c color_used_graph io_scaled; fi
+		else
+			graph_width=0
+		fi
+
+		print -v io_out -m ${disks_io_line[i]} ${col} -rs -fg ${theme[main_fg]} -jl 4 -t "IO:"
+		if ((graph_width>0)); then print -v io_out -fg ${theme[inactive_fg]} -rp ${graph_width} -t "⡀" -l ${graph_width} -t "${io_graph}"; fi
+		print -v io_out -rs -fg ${theme[main_fg]} -jr $((width-4-graph_width)) -t "${text}"
+	done
+
+	draw_out+="${io_out}"
+}
+
+draw_pressure() { #? Draw pressure stall graphs below memory and swap, "some" graphs grows upwards and "full" graphs downwards
+	unset psi_out
+	if ((box[psi_rows]==0)); then return; fi
+
+	local resource type name invert y_pos=$((box[m_line]+box[m_height])) col=${box[m_col]} width=$((box[m_width]-12))
+	local -a types=("some")
+	if ((box[psi_rows]==7)); then types+=("full"); fi
+
+	print -v psi_out -m $((y_pos++)) $col -rs -fg ${theme[title]} -b -jl 9 -t "Pressure:" -rs
+	if ((box[psi_rows]==7)); then print -v psi_out -fg ${theme[inactive_fg]} -jr $((box[m_width]-11)) -t "some/full"; fi
+
+	for resource in cpu memory io; do
+		case $resource in
+			cpu) name="Cpu";;
+			memory) name="Mem";;
+			io) name="Io";;
+		esac
+		for type in ${types[@]}; do
+			local -n psi_history="psi_history_${resource}_${type}"
+			if [[ $type == "full" ]]; then invert="-i"; else unset invert; fi
+			if ((resized>0)); then
+				create_graph -o "psi_graph_${resource}_${type}" -d ${y_pos} $((col+5)) 1 ${width} -n -c color_cpu_graph ${invert} "psi_history_${resource}_${type}"
+			elif [[ -n ${psi_history[*]} && -n ${collector_changed[pressure]} ]]; then
+				create_graph ${invert} -add-last "psi_graph_${resource}_${type}" "psi_history_${resource}_${type}"
+			fi
+			local -n psi_graph="psi_graph_${resource}_${type}"
+			psi_out+="${psi_graph[*]}"
+
+			if [[ $type == "full" ]]; then name=""; fi
+			print -v psi_out -m $((y_pos++)) $col -rs -fg ${theme[main_fg]} -jl 4 -t "${name}" -m $((y_pos-1)) $((col+width+5)) -jr 5 -t "${psi[${resource}_${type}]:+${psi[${resource}_${type}]}%}"
+		done
+	done
+
+	draw_out+="${psi_out}"
 }
 
-draw_mem() { #? Draw mem, swap and disk statistics
+draw_mem() { #? Draw mem, swap and disk statistics, only pressure and disk io is drawn if memory and disk usage hasn't been updated
+	if ((resized==0)) && [[ -z ${collector_changed[mem]}${collector_changed[disks]} ]]; then
+		if [[ -n ${collector_changed[pressure]} ]]; then draw_pressure; fi
+		if [[ -n ${collector_changed[diskio]} ]]; then draw_diskio; fi
+		return
+	fi
 
-	if ((mem[counter]>0 & resized==0)); then return; fi
+	draw_pressure
 
 	local i swap_used_meter swap_free_meter mem_available_meter mem_free_meter mem_used_meter mem_cached_meter normal_color="${theme[main_fg]}" value_text
 	local meter_mod_w meter_mod_pos value type m_title meter_options
@@ -2116,7 +3215,7 @@ draw_mem() { #? Draw mem, swap and disk statistics
 			m_title="memory"
 		else 
 			m_title="$type"
-			if ((height>14)); then ((y_pos++)); fi
+			if ((m_height>14)); then ((y_pos++)); fi
 		fi
 
 		#* Print name of type and total amount in humanized base 2 bytes
@@ -2127,18 +3226,18 @@ draw_mem() { #? Draw mem, swap and disk statistics
 			elif [[ $type == "swap" && $value == "cached" ]]; then break 2; fi
 
 			value_text="${value::$((m_width-12))}"
-			if ((height<14)); then value_text="${value_text::5}"; fi
+			if ((m_height<14)); then value_text="${value_text::5}"; fi
 			
 			#* Print name of value and value amount in humanized base 2 bytes
 			print -v mem_out -m $y_pos $m_col -rs -fg $normal_color -jl 9 -t "${value_text^}:" -m $((y_pos++)) $((mem_line-10)) -jr 9 -trans -t " ${type_name[${value}_string]::$((m_width-11))}"
 			
 			#* Create meter for value and calculate size and placement depending on terminal size
-			if ((height>v_height++ | tty_width>100)); then
-				if ((height<=v_height & tty_width<150)); then
+			if ((m_height>v_height++ | tty_width>100)); then
+				if ((m_height<=v_height & tty_width<150)); then
 					meter_mod_w=12
 					meter_mod_pos=7
 					((y_pos--))
-				elif ((height<=v_height)); then
+				elif ((m_height<=v_height)); then
 					print -v mem_out -m $((--y_pos)) $((m_col+5)) -jr 4 -t "${type_name[${value}_percent]}%"
 					meter_mod_w=14
 					meter_mod_pos=10
@@ -2153,36 +3252,59 @@ draw_mem() { #? Draw mem, swap and disk statistics
 		done
 	 done
 
+	#* Print extra fields from "/proc/meminfo" with a meter between name and value if wide enough, one row each in the rows left
+	local field field_width=$((m_width-23))
+	if [[ -n ${mem_fields} ]] && ((y_pos<m_line+m_height-1)); then ((y_pos++)); fi
+	for field in ${mem_fields}; do
+		if ((y_pos>=m_line+m_height)); then break; fi
+		if [[ -z ${mem[${field}_string]} ]]; then continue; fi
+		print -v mem_out -m $y_pos $m_col -rs -fg $normal_color -jl 10 -t "${field::9}:"
+		if ((field_width>=4)); then
+			create_meter -v meter -w ${field_width} -f -c color_used_graph ${mem[${field}_percent]}
+			print -v mem_out -t "${meter}" -rs -fg $normal_color
+		fi
+		print -v mem_out -m $((y_pos++)) $((mem_line-10)) -jr 9 -trans -t " ${mem[${field}_string]::$((m_width-11))}"
+	done
+
 
 	#* Create text and meters for disks and adapt sizes based on available height
-	local disk_num disk_name disk_value v_height2
+	local disk_num disk_name disk_value v_height2 disk_height=$height dev
 	y_pos=$m_line
 	m_col=$((m_col+m_width))
 	m_width=${box[m_width2]}
 	v_height=$((${#disks_name[@]}))
 	unset meter_mod_w meter_mod_pos
 
+	#* A row for disk io is added below the name if there is room, rows for values are then fitted in the height left
+	disks_io_line=()
+	box[io_col]=${m_col}; box[io_width]=$((m_width-2))
+	if ((height>=v_height*4)) && [[ -n ${disks_io_dev[*]} ]]; then disk_height=$((height-v_height)); fi
+
 	for disk_name in "${disks_name[@]}"; do
 		if ((y_pos>m_line+height-2)); then break; fi
 
 		#* Print folder disk is mounted on and total size in humanized base 2 bytes
 		print -v mem_out -m $((y_pos++)) $m_col -rs -fg ${theme[title]} -b -jl 9 -t "${disks_name[disk_num]::10}" -jr $((m_width-11)) -t "${disks_total[disk_num]::$((m_width-11))}"
 
+		#* Row is left for draw_diskio which updates it when disk io is collected
+		dev="${disks_io_dev[disk_num]}"
+		if ((disk_height<height)) && [[ -n ${dev} && -n ${diskio[${dev}_reads]} ]]; then disks_io_line[disk_num]=$((y_pos++)); fi
+
 		for value in "used" "free"; do
-			if ((height<v_height*3)) && [[ $value == "free" ]]; then break; fi
+			if ((disk_height<v_height*3)) && [[ $value == "free" ]]; then break; fi
 			local -n disk_value="disks_${value}"
 
 			#* Print name of value and value amount in humanized base 2 bytes
 			print -v mem_out -m $((y_pos++)) $m_col -rs -fg $normal_color -jl 9 -t "${value^}:" -jr $((m_width-11)) -t "${disk_value[disk_num]::$((m_width-11))}"
 
 			#* Create meter for value and calculate size and placement depending on terminal size
-			if ((height>=v_height*5 | tty_width>100)); then
+			if ((disk_height>=v_height*5 | tty_width>100)); then
 				local -n disk_value_percent="disks_${value}_percent"
-				if ((height<=v_height*5 & tty_width<150)); then
+				if ((disk_height<=v_height*5 & tty_width<150)); then
 					meter_mod_w=12
 					meter_mod_pos=7
 					((y_pos--))
-				elif ((height<=v_height*5)); then
+				elif ((disk_height<=v_height*5)); then
 					print -v mem_out -m $((--y_pos)) $((m_col+5)) -jr 4 -t "${disk_value_percent[disk_num]}%"
 					meter_mod_w=14
 					meter_mod_pos=10
@@ -2196,13 +3318,14 @@ draw_mem() { #? Draw mem, swap and disk statistics
 			fi
 			if ((y_pos>m_line+height-1)); then break; fi
 		done
-		if ((height>=v_height*4 & height<v_height*5 | height>=v_height*6)); then ((y_pos++)); fi
+		if ((disk_height>=v_height*4 & disk_height<v_height*5 | disk_height>=v_height*6)); then ((y_pos++)); fi
 		((++disk_num))
 	done
 
 	if ((resized>0)); then ((resized++)); fi
 	#* Print created text, graph and meters to output variable
 	draw_out+="${mem_graph[*]}${swap_graph[*]}${mem_out}"
+	draw_diskio
 
 }
 
@@ -2211,7 +3334,7 @@ draw_processes() { #? Draw processes and values to screen
 	if [[ -n $skip_process_draw && $argument != "now" ]]; then return; fi
 	local line=${box[processes_line]} col=${box[processes_col]} width=${box[processes_width]} height=${box[processes_height]} out_line y=1 fg_step_r=0 fg_step_g=0 fg_step_b=0 checker=2 page_string
 	local reverse_string reverse_pos order_left="───────────┤" filter_string current_num detail_location det_no_add com_fg pg_arrow_up_fg pg_arrow_down_fg
-	local pid=0 pid_graph pid_step_r pid_step_g pid_step_b pid_add_r pid_add_g pid_add_b bg_add bg_step proc_start up_fg down_fg page_up_fg page_down_fg this_box=processes
+	local pid=0 pid_graph pid_step_r pid_step_g pid_step_b pid_add_r pid_add_g pid_add_b bg_add bg_step up_fg down_fg page_up_fg page_down_fg this_box=processes
 	local d_width=${box[details_width]} d_height=${box[details_height]} d_line=${box[details_line]} d_col=${box[details_col]}
 	local detail_graph_width=$((d_width/3+2)) detail_graph_height=$((d_height-1)) kill_fg det_mod fg_add_r fg_add_g fg_add_b
 	local right_width=$((d_width-detail_graph_width-2))
@@ -2329,10 +3452,8 @@ draw_processes() { #? Draw processes and values to screen
 	fi
 
 
-	if ((proc[page]==1)); then proc_start=1
-	else proc_start=$(( (height-3)*(proc[page]-1)+1 )); fi
-
-	if ((proc_start+proc[selected]>${#proc_array[@]})); then proc[selected]=$((${#proc_array[@]}-proc_start)); fi
+	#* Only rows for the visible page are kept in proc_array
+	if ((proc[selected]>${#proc_array[@]}-1)); then proc[selected]=$((${#proc_array[@]}-1)); fi
 
 	if ((proc[selected]>1)); then
 		fg_r="$(( fg_r-( fg_add_r*(proc[selected]-1) ) ))"
@@ -2349,9 +3470,9 @@ draw_processes() { #? Draw processes and values to screen
 	print -v proc_out -rs -m $((line+y++)) $((col+1)) -fg ${theme[title]} -b -t "${proc_array[0]::$((width-3))} " -rs
 
 
-	for out_line in "${proc_array[@]:$proc_start}"; do
+	for out_line in "${proc_array[@]:1}"; do
 		pid="${out_line::$((proc[pid_len]+1))}"; pid="${pid// /}"
-		pid_graph="pid_${pid}_graph"
+		pid_graph="${graph_slot[${pid}]}"
 
 		if ((current_num==proc[selected])); then print -v proc_out -bg ${theme[selected_bg]} -fg ${theme[selected_fg]} -b; proc[selected_pid]="$pid"
 		else print -v proc_out -rs -fg $((fg_r-fg_step_r)) $((fg_b-fg_step_b)) $((fg_b-fg_step_b)); fi
@@ -2362,8 +3483,8 @@ draw_processes() { #? Draw processes and values to screen
 		
 		print -v proc_out -m $((line+y)) $((col+width-12)) -fg ${theme[inactive_fg]} -t "⡀⡀⡀⡀⡀"
 
-		if [[ -n ${!pid_graph} ]]; then
-			print -v proc_out -m $((line+y)) $((col+width-12)) -fg $((pid_r-pid_step_r)) $((pid_g-pid_step_g)) $((pid_b-pid_step_b)) -t "${!pid_graph}"
+		if [[ -n ${pid_graph} && -n ${graph_pool[pid_graph]} ]]; then
+			print -v proc_out -m $((line+y)) $((col+width-12)) -fg $((pid_r-pid_step_r)) $((pid_g-pid_step_g)) $((pid_b-pid_step_b)) -t "${graph_pool[pid_graph]}"
 		fi
 		
 		((y++))
@@ -2424,7 +3545,7 @@ draw_processes() { #? Draw processes and values to screen
 		unset proc_misc2
 		proc[page_change]=0
 		if ((proc[selected]>0)); then up_fg="${theme[hi_fg]}"; kill_fg="${theme[hi_fg]}"; com_fg="${theme[title]}"; else up_fg="${theme[inactive_fg]}"; kill_fg="${theme[inactive_fg]}"; com_fg="${theme[inactive_fg]}"; fi
-		if ((proc[selected]==${#proc_array[@]}-proc_start)); then down_fg="${theme[inactive_fg]}"; else down_fg="${theme[hi_fg]}"; fi
+		if ((proc[selected]==${#proc_array[@]}-1 & proc[page]==proc[pages])); then down_fg="${theme[inactive_fg]}"; else down_fg="${theme[hi_fg]}"; fi
 
 		if ((proc[page]>1)); then page_up_fg="${theme[title]}"; pg_arrow_up_fg="${theme[hi_fg]}"; else page_up_fg="${theme[inactive_fg]}"; pg_arrow_up_fg="${theme[inactive_fg]}"; fi
 		if ((proc[page]<proc[pages])); then page_down_fg="${theme[title]}"; pg_arrow_down_fg="${theme[hi_fg]}" ; else page_down_fg="${theme[inactive_fg]}"; pg_arrow_down_fg="${theme[inactive_fg]}"; fi
@@ -2649,6 +3770,7 @@ help_() { #? Shows the help overlay
 		"(Home) (End)"
 		"(Left, Right)"
 		"(R, r)"
+		"(V, v)"
 		"(F, f)"
 		"(C, c)"
 		"(T, t)"
@@ -2667,7 +3789,8 @@ help_() { #? Shows the help overlay
 		"Jump to first or last page in process list."
 		"Select previous/next sorting column."
 		"Reverse sorting order in processes box."
-		"Input a string to filter processes with."
+		"Toggle interrupts per cpu in place of cpu graph."
+		"Input filter, or terms pid: program: cmd: user:"
 		"Clear any entered filter."
 		"Terminate selected process with SIGTERM - 15."
 		"Kill selected process with SIGKILL - 9."
@@ -2762,16 +3885,17 @@ options_() { #? Shows the options overlay
 						"\"threads\", \"user\", \"memory\", \"cpu lazy\" and"
 						"\"cpu responsive\"."
 						" "
-						"\"cpu lazy\" uses ps commands internal sorting"
-						"and updates top process over a period of time."
+						"\"cpu lazy\" sorts on cpu usage over process"
+						"lifetime and updates top process over a period"
+						"of time."
 						" "
 						"\"cpu responsive\" updates sorting directly at a"
 						"cost of cpu time.")
 	desc_check_temp=(	"Check cpu temperature."
 						" "
-						"Only works if sensors command is available"
-						"and show values for Package and Core"
-						"temperatures.")
+						"Only works if a cpu sensor is found in"
+						"/sys/class/hwmon or /sys/class/thermal."
+						" ")
 	desc_draw_clock=(	"Draw a clock at top of screen."
 						" "
 						"Formatting according to strftime, empty"
@@ -3243,13 +4367,13 @@ process_input() { #? Process keypresses for main ui
 			;;
 			down|tab) #* Move process selector down one
 				if ! ((proc[page]==proc[pages] & proc[selected]>=box[processes_height]-3)); then
-					if ((++proc[selected]==1)); then collect_processes now; proc[detailed_change]=1; fi
+					if ((++proc[selected]==1)); then proc[detailed_change]=1; fi
 					if ((proc[selected]>box[processes_height]-3)); then ((proc[page]++)); proc[selected]=1; fi
 					proc[page_change]=1
 				fi
 			;;
 			enter) #* Show detailed info for selected process or close detailed info if no new process is selected
-				if ((proc[selected]>0 & proc[detailed_pid]!=proc[selected_pid])) && ps -p ${proc[selected_pid]} > /dev/null 2>&1; then
+				if ((proc[selected]>0 & proc[detailed_pid]!=proc[selected_pid])) && [[ -e /proc/${proc[selected_pid]}/stat ]]; then
 					proc[detailed]=1
 					proc[detailed_change]=1
 					proc[detailed_pid]=${proc[selected_pid]}
@@ -3276,7 +4400,7 @@ process_input() { #? Process keypresses for main ui
 			;;
 			page_down) #* Move down one page in process box
 				if [[ ${proc[page]} -lt ${proc[pages]} ]]; then
-					if ((proc[page]++==1)); then collect_processes now; fi
+					((++proc[page]))
 					proc[page_change]=1
 				elif [[ ${proc[selected]} -gt 0 ]]; then
 					proc[selected]=$((box[processes_height]-3))
@@ -3288,7 +4412,6 @@ process_input() { #? Process keypresses for main ui
 					proc[page_change]=1
 			;;
 			end) #* Go to last page in process box
-					if ((proc[selected]==0)); then collect_processes now; fi
 					proc[page]=${proc[pages]}
 					proc[page_change]=1
 			;;
@@ -3326,6 +4449,10 @@ process_input() { #? Process keypresses for main ui
 			m|M|escape) #* Show main menu
 				menu_
 			;;
+			v|V) #* Toggle interrupts per cpu in place of cpu graph
+				if [[ $cpu_irq_view == true ]]; then cpu_irq_view="false"; else cpu_irq_view="true"; fi
+				resized=1
+			;;
 			f|F) #* Start process filtering input
 				input_to_filter=1
 				filter_change=1
@@ -3352,6 +4479,7 @@ process_input() { #? Process keypresses for main ui
 		proc[filter_change]=1
 		draw_processes now
 	elif [[ ${proc[page_change]} -eq 1 || ${proc[detailed_change]} == 1 ]]; then
+		if ((proc[page]!=proc[page_shown])); then select_processes; fi
 		if ((proc[selected]==0)); then unset 'proc[selected_pid]'; proc[detailed_change]=1; fi
 		draw_processes now
 	fi
@@ -3363,10 +4491,42 @@ process_input() { #? Process keypresses for main ui
 	return 0
 }
 
-collect_and_draw() { #? Run all collect and draw functions
-	local task_int=0
+collector_due() { #? Check if a collector should run this update, usage: collector_due <name>
+	local name="$1"
+
+	#* Optional collectors only run if enabled, the process list always runs when resized and temps when missing
+	#* disks run every update while "df" is running to read its results
+	case ${name} in
+		processes) if ((resized>0)); then return 0; fi;;
+		temps)
+			if [[ $check_temp != true ]]; then return 1; fi
+			if [[ -z ${cpu[temp_0]} ]]; then return 0; fi
+		;;
+		pressure) if [[ -z ${psi[available]} ]]; then return 1; fi;;
+		disks) if [[ -n ${df_fd} ]]; then return 0; fi;;
+	esac
+
+	#* Due at the update closest to its own update time
+	if ((timestamp_start-${collector[${name}_last]:-0}+update_ms/2<collector[${name}_interval])); then return 1; fi
+}
+
+collect_and_draw() { #? Run collectors that are due and draw boxes with updated data, all boxes are drawn if resized
+	local task task_int=0 name due draw_len proc_start proc_end proc_interval
+	collector_changed=()
+
 	for task in processes cpu mem net; do
 		((++task_int))
+
+		#* Box is skipped if none of its collectors are due unless screen needs redrawing
+		unset due
+		for name in "${collectors[@]}"; do
+			if [[ ${collector[${name}_box]} == "${task}" ]] && collector_due ${name}; then due+=" ${name}"; fi
+		done
+
+		#* Mounts are only checked when the memory box is updated anyway, disks are then updated at once if they have changed
+		if [[ ${task} == "mem" && -n ${due} && ${due} != *" disks"* ]] && get_mounts; then due+=" disks"; fi
+		if [[ -z ${due} ]] && ((resized==0)); then continue; fi
+
 		if [[ -n $pause_screen && -n ${saved_key[0]} ]]; then 
 			return
 		elif [[ -z $pause_screen ]]; then
@@ -3375,15 +4535,43 @@ collect_and_draw() { #? Run all collect and draw functions
 				unset late_update
 			done
 		fi
-		collect_${task}
+
+		for name in ${due}; do
+			#* A running "df" is polled for results every update without moving the time disks was last updated
+			if [[ ${name} != "disks" || -z ${df_fd} ]]; then collector[${name}_last]=${timestamp_start}; fi
+			if [[ ${name} == "processes" ]]; then get_ms proc_start; fi
+
+			${collector[${name}_function]}
+
+			#* Disks are only redrawn when "df" had new results
+			if [[ ${name} != "disks" || -n ${mem[df_updated]} ]]; then collector_changed[${name}]=1; fi
+
+			#* Time used for process list sets a minimum interval if a cpu budget is set, 100 / budget in percent is the time to wait per ms used
+			#* time spent backfilling in windowed mode since last update is included
+			if [[ ${name} == "processes" ]]; then
+				get_ms proc_end
+				proc_end=$((proc_end+${proc[backfill_ms]:-0}))
+				proc[backfill_ms]=0
+				proc_interval=${proc_update_ms}
+				if ((proc_cpu_budget>0)) && (((proc_end-proc_start)*100/proc_cpu_budget>proc_interval)); then proc_interval=$(( (proc_end-proc_start)*100/proc_cpu_budget )); fi
+				collector[processes_interval]=${proc_interval}
+			fi
+		done
 		if get_key -save && [[ -z $pause_screen ]]; then process_input; fi
+
+		#* Output of cpu and net boxes is kept for redrawing the screen when boxes are skipped
+		draw_len=${#draw_out}
 		draw_${task}
+		if [[ ${task} == "cpu" || ${task} == "net" ]]; then box[${task}_out]="${draw_out:draw_len}"; fi
 		if get_key -save && [[ -z $pause_screen ]]; then process_input; fi
+
 		draw_clock "$1"
 		if ((resized>0 & resized<task_int)); then return; fi
 	done
 
-	last_screen="${draw_out}"
+	#* Clock is kept updated when no box was due
+	if [[ -z ${collector_changed[*]} ]]; then draw_clock "$1"; fi
+	last_screen="${box[cpu_out]}${psi_out}${io_out}${box[net_out]}"
 }
 
 #? ----------------------------------------------------------------------------------------------------------------------- ?#
@@ -3425,6 +4613,14 @@ main_loop() { #? main loop...
 		#* Divide waiting time in chunks of 500ms and below to keep program responsive while reading input
 		while ((time_left>0 & resized==0)); do
 
+			#* In windowed mode processes not shown are read in chunks before waiting
+			if [[ $proc_windowed == true ]] && ((proc[backfill_left]>0)); then
+				backfill_processes
+				get_ms timestamp_end
+				time_left=$((timestamp_start+update_ms-timestamp_end))
+				if ((time_left<=0)); then break; fi
+			fi
+
 			#* If NOT waiting for input and time left is greater than 500ms, wait 500ms and loop
 			if [[ -z $input_to_filter ]] && ((time_left>=500)); then
 				wait_string="0.5"
@@ -3489,8 +4685,9 @@ else
 	unset 'save_array[@]'
 fi
 
-#* Set up traps for ctrl-c, soft kill, window resize, ctrl-z and resume from ctrl-z
-trap 'quitting=1; time_left=0' SIGINT SIGQUIT SIGTERM
+#* Set up traps for ctrl-c, soft kill, hangup, window resize, ctrl-z and resume from ctrl-z, stamp file is removed on any exit
+trap 'quitting=1; time_left=0' SIGINT SIGQUIT SIGTERM SIGHUP
+trap 'if [[ -n ${proc[passwd_stamp]} ]]; then rm -f "${proc[passwd_stamp]}" 2>/dev/null; fi' EXIT
 trap 'resized=1; time_left=0' SIGWINCH
 trap 'sleepy=1; time_left=0' SIGTSTP 
 trap 'resume_' SIGCONT